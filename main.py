@@ -1,28 +1,32 @@
 
-from sudoku.generator import SudokuGenerator
-from sudoku.solver import TreeSearchSudokuSolver
+from sudoku.bank import PuzzleBank
+from sudoku.generator import print_board
+from sudoku.solver import get_solver
 from sudoku.check_solution import is_valid_solution
 import os
 import platform 
+import sys
 
 if platform.system() == "Windows":
     os.environ["ANSI_COLORS_DISABLED"] = "1"
 
 
 
-generator = SudokuGenerator(difficulty="hard")
-sudoku_puzzle = generator.generate_sudoku()
-generator.print_board()
-generator.solution_board()
+# Draw a pre-generated puzzle from the bank (generated on the spot only if the bank is empty)
+sudoku_puzzle, bank_solution = PuzzleBank().draw("hard")
+print_board(sudoku_puzzle)
+print_board(bank_solution, title="Solution Board")
 print()
 
 
 
 
-solver = TreeSearchSudokuSolver(sudoku_puzzle)
+# Solver backend: "tree" (default), "backtracking" or "dlx", e.g. `python main.py dlx`
+solver_name = sys.argv[1] if len(sys.argv) > 1 else "tree"
+solver = get_solver(solver_name)(sudoku_puzzle.copy())  # Boards are solved in place: keep the puzzle
 solution = solver.solve_with_tot()
 #solver.print_thoughts()  # Print reasoning process
-print("TreeSearch solution:\n", solution)
+print(f"{solver_name} solution:\n", solution)
 
 
 
@@ -0,0 +1,135 @@
+import mmap
+import os
+import random
+import sys
+import threading
+
+from sudoku.board import Board
+from sudoku.config import BANK_DIR
+from sudoku.generator import SudokuGenerator
+
+
+class PuzzleStore:
+    """
+    Append-only file of fixed-width records: the N*N puzzle cells followed by the
+    N*N solution cells, one byte per cell (162 bytes for a 9x9 board).
+    Reads go through a read-only memory map, so any record is one slice away.
+    """
+    def __init__(self, path, size=9):
+        self.path = path
+        self.size = size
+        self.record_size = 2 * size * size
+        self._lock = threading.Lock()
+        self._file = open(path, "a+b")
+        # Drop a record cut short by a crash, or every later record would be misaligned
+        self._file.truncate(len(self) * self.record_size)
+        self._map = None
+        self._mapped = 0  # Records visible through the current map
+
+    def __len__(self):
+        return os.fstat(self._file.fileno()).st_size // self.record_size
+
+    def append(self, puzzle, solution):
+        """Add one puzzle/solution pair to the end of the file."""
+        with self._lock:
+            self._file.write(bytes(puzzle.cells) + bytes(solution.cells))
+            self._file.flush()
+
+    def get(self, index):
+        """Return the (puzzle, solution) Boards stored at 'index'."""
+        if index >= self._mapped:
+            self._remap()  # The file grew since it was last mapped
+        if not 0 <= index < self._mapped:
+            raise IndexError("puzzle index out of range")
+        cells = self.size * self.size
+        start = index * self.record_size
+        record = self._map[start:start + self.record_size]
+        return Board(self.size, record[:cells]), Board(self.size, record[cells:])
+
+    def _remap(self):
+        """Map every complete record currently in the file."""
+        with self._lock:
+            count = len(self)
+            if count > self._mapped:
+                # The old map is left to the garbage collector: another thread may still be slicing it
+                self._map = mmap.mmap(self._file.fileno(), count * self.record_size, access=mmap.ACCESS_READ)
+                self._mapped = count
+
+    def close(self):
+        self._file.close()
+
+
+class PuzzleBank:
+    """
+    Pre-generated puzzles, one PuzzleStore per difficulty, that a background
+    thread keeps topped up to 'target' records each.
+    """
+    def __init__(self, directory=BANK_DIR, size=9, target=1000):
+        self.directory = directory
+        self.size = size
+        self.target = target
+        self.difficulties = list(SudokuGenerator().difficulty_levels)
+        self.stores = {}
+        self._lock = threading.Lock()  # Guards opening stores from both threads
+        self._stop = threading.Event()
+        self._thread = None
+        os.makedirs(directory, exist_ok=True)
+
+    def store(self, difficulty):
+        """Return the store for a difficulty, opening its file on first use."""
+        with self._lock:
+            if difficulty not in self.stores:
+                name = difficulty.replace(" ", "_")
+                if self.size != 9:
+                    name += f"_{self.size}x{self.size}"
+                self.stores[difficulty] = PuzzleStore(os.path.join(self.directory, f"{name}.bin"), self.size)
+            return self.stores[difficulty]
+
+    def fill(self, difficulty, count):
+        """Generate 'count' puzzles synchronously and add them to the bank."""
+        store = self.store(difficulty)
+        for _ in range(count):
+            generator = SudokuGenerator(difficulty, size=self.size)
+            puzzle = generator.generate_sudoku()
+            store.append(puzzle, generator.solution)
+
+    def start(self):
+        """Start filling every difficulty up to 'target' in a daemon thread."""
+        if self._thread and self._thread.is_alive():
+            return self._thread
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="puzzle-bank", daemon=True)
+        self._thread.start()
+        return self._thread
+
+    def stop(self):
+        """Ask the background thread to finish after its current puzzle."""
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+
+    def _run(self):
+        while not self._stop.is_set():
+            # Top up the emptiest store first so every difficulty becomes available quickly
+            difficulty = min(self.difficulties, key=lambda level: len(self.store(level)))
+            if len(self.store(difficulty)) >= self.target:
+                return
+            self.fill(difficulty, 1)
+
+    def draw(self, difficulty, rng=random):
+        """Return a random (puzzle, solution) pair, generating one on the spot only if the store is empty."""
+        store = self.store(difficulty)
+        if len(store) == 0:
+            self.fill(difficulty, 1)
+        return store.get(rng.randrange(len(store)))
+
+
+if __name__ == "__main__":
+    # Pre-fill the bank, e.g. `python -m sudoku.bank 10000`
+    bank = PuzzleBank(target=int(sys.argv[1]) if len(sys.argv) > 1 else 1000)
+    for level in bank.difficulties:
+        missing = bank.target - len(bank.store(level))
+        if missing > 0:
+            print(f"🧩 Generating {missing} {level} puzzles...")
+            bank.fill(level, missing)
+        print(f"✅ {level}: {len(bank.store(level))} puzzles in {bank.store(level).path}")
@@ -0,0 +1,115 @@
+import math
+
+import numpy as np
+
+from sudoku.board import Board, as_board
+from sudoku.solver import solve_many
+
+
+def candidate_tensor(puzzles):
+    """
+    Build the (N, 9, 9, 9) boolean candidate tensor for a batch of puzzles
+    ((N, 16, 16, 16) for 16x16 boards, and so on; all boards share one size).
+    cand[n, row, col, num - 1] is True while 'num' can still go in that cell.
+    """
+    boards = [as_board(puzzle) for puzzle in puzzles]
+    size = boards[0].size if boards else 9
+    boards = np.frombuffer(b"".join(board.cells for board in boards), dtype=np.uint8).reshape(-1, size, size)
+    cand = np.ones(boards.shape + (size,), dtype=bool)
+    filled = boards > 0
+    cand[filled] = np.eye(size, dtype=bool)[boards[filled] - 1]
+    return cand
+
+
+def _unit_counts(x):
+    """
+    Count True entries per (num, row), (num, col) and (num, box) of a tensor laid
+    out as (num, row, col, board), each shaped to broadcast back onto its unit's cells.
+    Keeping the board axis last makes every reduction a sum of contiguous slices.
+    """
+    x = x.view(np.uint8)  # Summing uint8 directly avoids a bool cast in every reduction
+    size = x.shape[0]
+    box = math.isqrt(size)
+    rows = x.sum(axis=2, dtype=np.uint8)[:, :, None, :]
+    cols = x.sum(axis=1, dtype=np.uint8)[:, None, :, :]
+    boxes = x.reshape(size, box, box, box, box, -1).sum(axis=(2, 4), dtype=np.uint8)
+    boxes = boxes.repeat(box, axis=1).repeat(box, axis=2)
+    return rows, cols, boxes
+
+
+def propagate_batch(cand):
+    """
+    Run naked and hidden singles on every board at once until nothing changes.
+    'cand' is updated in place. Returns a per-board status array of
+    "solved", "invalid" (a contradiction was found) or "open" (needs search).
+    """
+    work = np.ascontiguousarray(cand.transpose(3, 1, 2, 0))  # (num, row, col, board)
+    dead = np.zeros(cand.shape[0], dtype=bool)
+    active = np.arange(cand.shape[0])  # Boards that changed in the last round
+    while active.size:  # Candidates only ever shrink, so every board reaches a fixed point
+        x = work.take(active, axis=3)  # Stays C-contiguous, unlike work[..., active]
+        before = x.view(np.uint8).sum(axis=(0, 1, 2), dtype=np.uint16)
+
+        # Naked singles: a decided cell removes its number from every peer
+        singles = x & (x.view(np.uint8).sum(axis=0, dtype=np.uint8) == 1)
+        rows, cols, boxes = _unit_counts(singles)
+        clash = ((rows > 1).any(axis=(0, 1, 2)) | (cols > 1).any(axis=(0, 1, 2))
+                 | (boxes > 1).any(axis=(0, 1, 2)))
+        x &= ~((rows > 0) | (cols > 0) | (boxes > 0)) | singles
+
+        # Hidden singles: a number with only one possible cell in a unit goes there
+        rows, cols, boxes = _unit_counts(x)
+        hidden = x & ((rows == 1) | (cols == 1) | (boxes == 1))
+        x &= hidden | ~hidden.any(axis=0)
+
+        # Contradictions: an empty cell, or a number with no place left in a unit
+        clash |= ~x.any(axis=0).all(axis=(0, 1))
+        clash |= ((rows == 0).any(axis=(0, 1, 2)) | (cols == 0).any(axis=(0, 1, 2))
+                  | (boxes == 0).any(axis=(0, 1, 2)))
+
+        work[..., active] = x
+        dead[active] |= clash
+        changed = x.view(np.uint8).sum(axis=(0, 1, 2), dtype=np.uint16) != before
+        active = active[changed & ~clash]
+
+    cand[...] = work.transpose(3, 1, 2, 0)
+    decided = (cand.sum(axis=3) == 1).all(axis=(1, 2))
+    status = np.where(dead, "invalid", np.where(decided, "solved", "open"))
+    return status
+
+
+def _to_board(cand):
+    """Convert one board's candidates to a Board, 0 where still undecided."""
+    values = cand.argmax(axis=2).astype(np.uint8) + 1
+    values[cand.sum(axis=2) != 1] = 0
+    return Board(cand.shape[0], values.tobytes())
+
+
+def solve_batch(puzzles, solver="tree", workers=1, max_steps=None):
+    """
+    Solve a batch by vectorized propagation, then hand the boards that are
+    still open to a scalar solver through solve_many().
+
+    Returns a list of (index, status, solution) in input order, with the same
+    statuses and solution format as solve_many().
+    """
+    cand = candidate_tensor(puzzles)
+    status = propagate_batch(cand)
+
+    results = [None] * cand.shape[0]
+    open_boards = []
+    for index in range(cand.shape[0]):
+        if status[index] == "solved":
+            board = _to_board(cand[index])
+            results[index] = (index, "solved", '\n'.join(' '.join(str(cell) for cell in row) for row in board))
+        elif status[index] == "invalid":
+            results[index] = (index, "unsolvable", None)
+        else:
+            open_boards.append(index)
+
+    # The partially propagated board is a valid (and easier) starting point for the search
+    remaining = [_to_board(cand[index]) for index in open_boards]
+    for position, result, solution in solve_many(remaining, workers=workers, solver=solver, max_steps=max_steps):
+        index = open_boards[position]
+        results[index] = (index, result, solution)
+    return results
@@ -0,0 +1,102 @@
+import math
+
+# Characters used for digits 1..25 in one-line puzzle strings
+DIGIT_CHARS = "123456789ABCDEFGHIJKLMNOP"
+
+
+class Board:
+    """
+    Compact NxN Sudoku board: one bytearray of N*N cells in row-major order, 0 = empty.
+
+    board[row][col] still works for reading and writing (each row is a writable
+    memoryview over the bytes), board[row, col] skips the row view, and hot
+    loops can use board.cells directly. Copying and hashing work on the raw bytes.
+    """
+    __slots__ = ("size", "cells")
+
+    def __init__(self, size=9, cells=None):
+        if math.isqrt(size) ** 2 != size:
+            raise ValueError(f"Board size must be a perfect square (4, 9, 16, 25...), got {size}")
+        self.size = size
+        self.cells = bytearray(size * size) if cells is None else bytearray(cells)
+        if len(self.cells) != size * size:
+            raise ValueError(f"Expected {size * size} cells, got {len(self.cells)}")
+
+    @classmethod
+    def from_rows(cls, rows):
+        """Build a board from a list of lists."""
+        return cls(len(rows), [num for row in rows for num in row])
+
+    @classmethod
+    def from_line(cls, line):
+        """Parse the one-line format ('1'-'9' then 'A'-'P', '0' or '.' for empty cells)."""
+        line = line.strip()
+        size = math.isqrt(len(line))
+        if size * size != len(line):
+            raise ValueError(f"Expected N*N cells, got {len(line)}")
+        return cls(size, [0 if ch in ".0" else DIGIT_CHARS.index(ch.upper()) + 1 for ch in line])
+
+    def copy(self):
+        """Return an independent copy (a single bytes copy, no deepcopy)."""
+        board = Board.__new__(Board)
+        board.size = self.size
+        board.cells = bytearray(self.cells)
+        return board
+
+    def to_rows(self):
+        """Return the board as a list of lists."""
+        size = self.size
+        return [list(self.cells[i:i + size]) for i in range(0, size * size, size)]
+
+    def to_line(self, empty="0"):
+        """Serialize to the one-line format."""
+        return "".join(DIGIT_CHARS[num - 1] if num else empty for num in self.cells)
+
+    def __getitem__(self, key):
+        if isinstance(key, tuple):
+            row, col = key
+            return self.cells[row * self.size + col]
+        start = key * self.size
+        if not 0 <= start < len(self.cells):
+            raise IndexError("board row out of range")
+        return memoryview(self.cells)[start:start + self.size]
+
+    def __setitem__(self, key, num):
+        row, col = key
+        self.cells[row * self.size + col] = num
+
+    def __len__(self):
+        return self.size
+
+    def __iter__(self):
+        view = memoryview(self.cells)
+        for start in range(0, len(self.cells), self.size):
+            yield view[start:start + self.size]
+
+    def __eq__(self, other):
+        if isinstance(other, Board):
+            return self.cells == other.cells
+        if isinstance(other, list):
+            return self.to_rows() == other
+        return NotImplemented
+
+    def __hash__(self):
+        return hash(bytes(self.cells))
+
+    def __str__(self):
+        return self.to_line()
+
+    def __repr__(self):
+        return f"Board({self.to_line('.')!r})"
+
+    def __reduce__(self):
+        return Board, (self.size, bytes(self.cells))
+
+
+def as_board(board):
+    """Return 'board' itself if it is already a Board, else a new Board built from rows or a line."""
+    if isinstance(board, Board):
+        return board
+    if isinstance(board, str):
+        return Board.from_line(board)
+    return Board.from_rows(board)
@@ -0,0 +1,294 @@
+import math
+
+# Digits encoded by every 10-bit mask, in ascending order (fast path for 9x9 boards)
+DIGITS_OF = [[num for num in range(1, 10) if mask >> num & 1] for mask in range(1 << 10)]
+
+
+def digits_of(mask):
+    """List the digits set in a candidate mask, in ascending order."""
+    if mask < 1024:
+        return DIGITS_OF[mask]
+    digits = []
+    while mask:
+        low = mask & -mask
+        digits.append(low.bit_length() - 1)
+        mask ^= low
+    return digits
+
+
+class Layout:
+    """Geometry of an NxN board (N a perfect square): box size, unit cells and lookup tables."""
+    def __init__(self, size):
+        box = math.isqrt(size)
+        if size < 1 or box * box != size:
+            raise ValueError(f"Board size must be a perfect square (4, 9, 16, 25...), got {size}")
+        self.size = size
+        self.box = box
+        self.all_digits = ((1 << size) - 1) << 1  # Bits 1..N set, bit 0 unused so digit d maps to 1 << d
+        self.box_of = [[box * (row // box) + col // box for col in range(size)] for row in range(size)]
+        # Cells of every row, column and box, used by the propagation rules
+        self.row_units = [[(row, col) for col in range(size)] for row in range(size)]
+        self.col_units = [[(row, col) for row in range(size)] for col in range(size)]
+        self.box_units = [[(box * (b // box) + i, box * (b % box) + j) for i in range(box) for j in range(box)]
+                          for b in range(size)]
+        self.units = self.row_units + self.col_units + self.box_units
+        # Flat-index views of the same tables, for the propagation hot loops
+        self.cell_row = [index // size for index in range(size * size)]
+        self.cell_col = [index % size for index in range(size * size)]
+        self.cell_box = [self.box_of[index // size][index % size] for index in range(size * size)]
+        self.unit_cells = [[row * size + col for row, col in unit] for unit in self.units]
+        self.peers = [sorted({other for unit in self.unit_cells if index in unit for other in unit} - {index})
+                      for index in range(size * size)]
+
+
+_LAYOUTS = {}
+
+
+def layout(size):
+    """Return the shared Layout for an NxN board."""
+    if size not in _LAYOUTS:
+        _LAYOUTS[size] = Layout(size)
+    return _LAYOUTS[size]
+
+
+class CandidateGrid:
+    """
+    Row, column and box bitmasks kept in sync with an NxN Board (9x9, 16x16, 25x25...).
+    Placing and removing digits goes through place()/remove() so that
+    legality checks and candidate lookups never rescan the board.
+
+    assign() and exclude() also record their change on a trail, so a search
+    can take a mark() before propagating and undo() back to it on failure.
+    """
+    def __init__(self, board):
+        self.board = board
+        self.cells = board.cells  # Flat row-major bytes, read directly in the hot loops
+        self.layout = layout(len(board))
+        self.size = size = self.layout.size
+        self.all_digits = self.layout.all_digits
+        self.box_of = self.layout.box_of
+        self.rows = [0] * size
+        self.cols = [0] * size
+        self.boxes = [0] * size
+        self.excluded = [0] * (size * size)  # Candidates pruned by inference, per cell (flat index)
+        self.trail = []  # (row, col, old excluded mask), old is None for a placement
+        for row in range(size):
+            for col in range(size):
+                num = self.cells[row * size + col]
+                if num != 0:
+                    bit = 1 << num
+                    self.rows[row] |= bit
+                    self.cols[col] |= bit
+                    self.boxes[self.box_of[row][col]] |= bit
+
+    def used(self, row, col):
+        """Mask of digits already present in the row, column or box of a cell."""
+        return self.rows[row] | self.cols[col] | self.boxes[self.box_of[row][col]]
+
+    def candidates(self, row, col):
+        """Mask of digits that can still go in the cell."""
+        return self.all_digits & ~(self.used(row, col) | self.excluded[row * self.size + col])
+
+    def is_valid(self, row, col, num):
+        """Check if placing 'num' at (row, col) follows Sudoku rules."""
+        return not self.used(row, col) >> num & 1
+
+    def place(self, row, col, num):
+        """Write 'num' into the board and mark it in the masks."""
+        bit = 1 << num
+        self.cells[row * self.size + col] = num
+        self.rows[row] |= bit
+        self.cols[col] |= bit
+        self.boxes[self.box_of[row][col]] |= bit
+
+    def remove(self, row, col):
+        """Clear the cell and unmark its digit from the masks."""
+        index = row * self.size + col
+        mask = ~(1 << self.cells[index])
+        self.cells[index] = 0
+        self.rows[row] &= mask
+        self.cols[col] &= mask
+        self.boxes[self.box_of[row][col]] &= mask
+
+    def assign(self, row, col, num):
+        """Place 'num' and record it on the trail."""
+        self.place(row, col, num)
+        self.trail.append((row, col, None))
+
+    def exclude(self, row, col, mask):
+        """Prune the digits in 'mask' from the cell's candidates and record it on the trail."""
+        index = row * self.size + col
+        self.trail.append((row, col, self.excluded[index]))
+        self.excluded[index] |= mask
+
+    def mark(self):
+        """Return a trail position that undo() can roll back to."""
+        return len(self.trail)
+
+    def undo(self, mark):
+        """Revert every assignment and exclusion made since 'mark'."""
+        trail = self.trail
+        while len(trail) > mark:
+            row, col, old = trail.pop()
+            if old is None:
+                self.remove(row, col)
+            else:
+                self.excluded[row * self.size + col] = old
+
+    def best_cell(self):
+        """Return (row, col, candidates) for the empty cell with the fewest candidates (MRV)."""
+        size, cells = self.size, self.cells
+        best, best_count = None, size + 1
+        for row in range(size):
+            for col in range(size):
+                if cells[row * size + col] == 0:
+                    mask = self.candidates(row, col)
+                    count = len(digits_of(mask))
+                    if count < best_count:
+                        best, best_count = (row, col, mask), count
+                        if count <= 1:
+                            return best
+        return best
+
+    def propagate(self, placed, pointing=True):
+        """
+        Apply naked singles, hidden singles and (if 'pointing') pointing pairs until
+        nothing changes. Forced placements are appended to 'placed' as (row, col, num).
+        Returns False as soon as a contradiction is found.
+        """
+        all_digits, cells, excluded = self.all_digits, self.cells, self.excluded
+        rows, cols, boxes = self.rows, self.cols, self.boxes
+        cell_row, cell_col, cell_box = self.layout.cell_row, self.layout.cell_col, self.layout.cell_box
+        while True:
+            progress = False
+
+            # Naked singles: a cell with exactly one candidate
+            for i in range(len(cells)):
+                if cells[i] == 0:
+                    row, col = cell_row[i], cell_col[i]
+                    mask = all_digits & ~(rows[row] | cols[col] | boxes[cell_box[i]] | excluded[i])
+                    if mask == 0:
+                        return False
+                    if mask & (mask - 1) == 0:
+                        num = mask.bit_length() - 1
+                        self.assign(row, col, num)
+                        placed.append((row, col, num))
+                        progress = True
+
+            # Hidden singles: a digit with exactly one possible cell in a unit
+            for unit in self.layout.unit_cells:
+                present = once = twice = 0
+                for i in unit:
+                    num = cells[i]
+                    if num != 0:
+                        present |= 1 << num
+                    else:
+                        mask = all_digits & ~(rows[cell_row[i]] | cols[cell_col[i]] | boxes[cell_box[i]] | excluded[i])
+                        twice |= once & mask
+                        once |= mask
+                if present | once != all_digits:
+                    return False  # Some digit has nowhere to go
+                singles = once & ~twice
+                if singles:
+                    for num in digits_of(singles):
+                        for i in unit:
+                            if cells[i] == 0 and self.candidates(cell_row[i], cell_col[i]) >> num & 1:
+                                self.assign(cell_row[i], cell_col[i], num)
+                                placed.append((cell_row[i], cell_col[i], num))
+                                progress = True
+                                break
+
+            if progress:
+                continue
+            if not pointing:
+                return True
+
+            # Pointing pairs: a digit confined to one row/column of a box is removed
+            # from the rest of that row/column
+            row_units, col_units = self.layout.row_units, self.layout.col_units
+            for box, unit in enumerate(self.layout.box_units):
+                for num in digits_of(all_digits & ~boxes[box]):
+                    bit = 1 << num
+                    spots = [(row, col) for row, col in unit
+                             if cells[row * self.size + col] == 0 and self.candidates(row, col) & bit]
+                    if not spots:
+                        return False
+                    spot_rows = {row for row, _ in spots}
+                    spot_cols = {col for _, col in spots}
+                    if len(spot_rows) == 1:
+                        line = row_units[spots[0][0]]
+                    elif len(spot_cols) == 1:
+                        line = col_units[spots[0][1]]
+                    else:
+                        continue
+                    for row, col in line:
+                        if (self.box_of[row][col] != box and cells[row * self.size + col] == 0
+                                and self.candidates(row, col) & bit):
+                            self.exclude(row, col, bit)
+                            progress = True
+
+            if not progress:
+                return True
+
+
+def count_solutions(board, limit=2):
+    """
+    Count the solutions of a Board, stopping as soon as 'limit' are found
+    (the default answers "is it unique?"). The board itself is left untouched.
+    Uses the candidate masks, propagation before every branch and MRV branching.
+    """
+    grid = CandidateGrid(board.copy())
+    filled = len(board.cells) - board.cells.count(0)
+    for masks in (grid.rows, grid.cols, grid.boxes):
+        if sum(len(digits_of(mask)) for mask in masks) != filled:
+            return 0  # Two clues clash in some unit
+    return _count_solutions(grid, limit)
+
+
+def _count_solutions(grid, limit, budget=None):
+    """
+    Recursive helper for count_solutions(); restores the grid before returning.
+    'budget' is an optional one-item list of search nodes left: once it runs out the
+    search gives up and returns 'limit', as if enough solutions had been found.
+    """
+    if budget is not None:
+        if budget[0] <= 0:
+            return limit
+        budget[0] -= 1
+    mark = grid.mark()
+    # Pointing pairs cost more per node than they save, even on 16x16 and 25x25 boards
+    if not grid.propagate([], pointing=False):
+        grid.undo(mark)
+        return 0
+
+    empty = grid.best_cell()
+    if not empty:
+        grid.undo(mark)
+        return 1  # Found a valid solution
+
+    row, col, mask = empty
+    count = 0
+    for num in digits_of(mask):
+        guess = grid.mark()
+        grid.assign(row, col, num)
+        count += _count_solutions(grid, limit - count, budget)
+        grid.undo(guess)
+        if count >= limit:  # Stop early once the limit is reached
+            break
+
+    grid.undo(mark)
+    return count
+
+
+def is_forced(grid, row, col, num, max_nodes=None):
+    """
+    True if every solution of the grid has 'num' at (row, col), i.e. no solution
+    survives with 'num' excluded from that cell. The grid is restored before returning.
+    With 'max_nodes', a search that needs more nodes than that answers False
+    (not proven forced), which is always safe for keeping a puzzle unique.
+    """
+    mark = grid.mark()
+    grid.exclude(row, col, 1 << num)
+    found = _count_solutions(grid, 1, [max_nodes] if max_nodes is not None else None)
+    grid.undo(mark)
+    return found == 0
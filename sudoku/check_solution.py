@@ -1,52 +1,65 @@
+import math
+
 from termcolor import colored
 
-def is_valid_solution(board, solution):
+from sudoku.board import as_board
+from sudoku.solution_cache import make_cache
+
+def is_valid_solution(board, solution, cache=None):
+    board, solution = as_board(board), as_board(solution)  # Accepts Boards, lists of lists or lines
+    cache = make_cache(cache)  # Optional SolutionCache: a known solution is compared directly
+    known = cache.get(board) if cache is not None else None
+    size = len(solution)  # 9 for classic Sudoku, 16 or 25 for larger grids
+    box = math.isqrt(size)
+    digits = list(range(1, size + 1))
+
     def is_valid_group(group):
-        return sorted(group) == list(range(1, 10))  # Must contain 1-9 exactly once
+        return sorted(group) == digits  # Must contain 1-N exactly once
 
     errors = []  # Store errors
     error_positions = set()  # Track incorrect cells
 
-    # Check rows & columns
-    for i in range(9):
-        if not is_valid_group(solution[i]):
-            errors.append(f"❌ Row {i+1} is invalid: {solution[i]}")
-            for j in range(9):
-                error_positions.add((i, j))
-
-        col = [solution[j][i] for j in range(9)]
-        if not is_valid_group(col):
-            errors.append(f"❌ Column {i+1} is invalid: {col}")
-            for j in range(9):
-                error_positions.add((j, i))
-
-    # Check 3x3 subgrids
-    for box_row in range(3):
-        for box_col in range(3):
-            subgrid = []
-            subgrid_positions = []
-            for r in range(3):
-                for c in range(3):
-                    row, col = box_row * 3 + r, box_col * 3 + c
-                    subgrid.append(solution[row][col])
-                    subgrid_positions.append((row, col))
-            if not is_valid_group(subgrid):
-                errors.append(f"❌ Subgrid ({box_row+1},{box_col+1}) is invalid: {subgrid}")
-                error_positions.update(subgrid_positions)
+    if known != solution:  # Skipped when the cache already holds this exact solution
+        # Check rows & columns
+        for i in range(size):
+            if not is_valid_group(solution[i]):
+                errors.append(f"❌ Row {i+1} is invalid: {list(solution[i])}")
+                for j in range(size):
+                    error_positions.add((i, j))
+
+            col = [solution[j][i] for j in range(size)]
+            if not is_valid_group(col):
+                errors.append(f"❌ Column {i+1} is invalid: {col}")
+                for j in range(size):
+                    error_positions.add((j, i))
+
+        # Check box x box subgrids
+        for box_row in range(box):
+            for box_col in range(box):
+                subgrid = []
+                subgrid_positions = []
+                for r in range(box):
+                    for c in range(box):
+                        row, col = box_row * box + r, box_col * box + c
+                        subgrid.append(solution[row][col])
+                        subgrid_positions.append((row, col))
+                if not is_valid_group(subgrid):
+                    errors.append(f"❌ Subgrid ({box_row+1},{box_col+1}) is invalid: {subgrid}")
+                    error_positions.update(subgrid_positions)
 
     # Check pre-filled numbers
-    for r in range(9):
-        for c in range(9):
+    for r in range(size):
+        for c in range(size):
             if board[r][c] != 0 and board[r][c] != solution[r][c]:
                 errors.append(f"❌ Mismatch at ({r+1},{c+1}): Expected {board[r][c]}, found {solution[r][c]}")
                 error_positions.add((r, c))
 
     # Print board with errors highlighted
     print("\n🔹 Sudoku Solution Check 🔹")
-    for r in range(9):
+    for r in range(size):
         """if r % 3 == 0 and r != 0:
             print("-" * 21)  # Horizontal separator for 3x3 grids"""
-        for c in range(9):
+        for c in range(size):
             num = solution[r][c]
             if (r, c) in error_positions:
                 print(colored(f"{num}", "red"), end=" ")  # Print errors in red
@@ -62,6 +75,8 @@ def is_valid_solution(board, solution):
         print("❌ The solution is incorrect.")
         return False
 
+    if cache is not None and known is None:
+        cache.put(board, solution)
     print("✅ The solution is correct!")
     return True
 
@@ -74,7 +89,7 @@ if __name__ == '__main__':
 
     if platform.system() == "Windows":
         os.environ["ANSI_COLORS_DISABLED"] = "1"
-    # Example Sudoku Board
+    # Example Sudoku Board (`python -m sudoku.check_solution` from the repository root)
     board = [
         [5, 3, 0, 0, 7, 0, 0, 0, 0],
         [6, 0, 0, 1, 9, 5, 0, 0, 0],
@@ -1,3 +1,7 @@
 
 MODEL_NAME           = 'model.gguf'
 MODEL_PATH           = f'path/to/your/model/folder/{MODEL_NAME}'
+LLM_BACKEND          = 'llama'  # 'llama', or 'fake' to run the LLM solver without a model
+BANK_DIR             = 'puzzle_bank'  # Pre-generated puzzles, see sudoku/bank.py
+CACHE_PATH           = 'solution_cache.sqlite'  # Solutions keyed by canonical form, see sudoku/canonical.py
+LLM_CACHE_PATH       = 'llm_cache.sqlite'  # LLM answers keyed by request, see sudoku/llm_cache.py
@@ -1,9 +1,27 @@
 import random
-import copy
+import warnings
+
+from sudoku.board import Board, as_board
+from sudoku.candidates import CandidateGrid, count_solutions, digits_of, is_forced, layout
+from sudoku.pool import run_jobs
+from sudoku.rater import BANDS, difficulty_of, rate
+from sudoku.symmetry import Transform
 
 class SudokuGenerator:
-    def __init__(self, difficulty="medium"):
-        self.board = [[0 for _ in range(9)] for _ in range(9)]
+    def __init__(self, difficulty="medium", size=9, symmetric=False, rated=False, seed=None):
+        # Own RNG when seeded, so runs are reproducible and independent of other generators
+        self.rng = random.Random(seed) if seed is not None else random
+        self.size = size  # 9 for classic Sudoku, 16 or 25 for larger grids
+        self.symmetric = symmetric  # Remove cells in 180-degree rotational pairs
+        self.difficulty = difficulty
+        self.rated = rated  # Match 'difficulty' by technique rating instead of by empty-cell count
+        self.rating = None  # (score, technique) of the last rated puzzle
+        self.box = layout(size).box
+        # Search nodes allowed per uniqueness proof while digging (None: no limit). Proofs on
+        # 16x16 and larger boards can take minutes each once many cells are empty; a cell
+        # whose removal is not proven within the cap simply stays a clue
+        self.max_nodes = None if size <= 9 else 10
+        self.board = Board(size)
         self.solution = None  # Store the full solution
         self.difficulty_levels = {
             "very easy": 25,  # Fewer empty cells
@@ -12,105 +30,171 @@ class SudokuGenerator:
             "hard": 50,
             "expert": 55  # More empty cells, harder puzzle
         }
-        self.empty_cells = self.difficulty_levels.get(difficulty, 40)
+        # Levels are empty-cell counts for a 9x9 board; larger boards keep the same proportion
+        self.empty_cells = round(self.difficulty_levels.get(difficulty, 40) * size * size / 81)
 
     def is_valid(self, board, row, col, num):
         """Check if num can be placed at board[row][col]."""
-        for x in range(9):
+        for x in range(self.size):
             if board[row][x] == num or board[x][col] == num:
                 return False
 
-        start_row, start_col = 3 * (row // 3), 3 * (col // 3)
-        for i in range(3):
-            for j in range(3):
+        start_row, start_col = self.box * (row // self.box), self.box * (col // self.box)
+        for i in range(self.box):
+            for j in range(self.box):
                 if board[i + start_row][j + start_col] == num:
                     return False
         return True
 
     def solve(self, board):
         """Backtracking solver to generate a valid Sudoku solution."""
-        empty = self.find_empty_location(board)
+        return self._fill(CandidateGrid(as_board(board)))
+
+    def _fill(self, grid):
+        """Randomized backtracking on the most constrained cell, using the grid's masks."""
+        empty = grid.best_cell()
         if not empty:
             return True
-        row, col = empty
+        row, col, mask = empty
 
-        nums = list(range(1, 10))
-        random.shuffle(nums)  # Randomize number selection
+        nums = list(digits_of(mask))
+        self.rng.shuffle(nums)  # Randomize number selection
         for num in nums:
-            if self.is_valid(board, row, col, num):
-                board[row][col] = num
-                if self.solve(board):
-                    return True
-                board[row][col] = 0
+            grid.place(row, col, num)
+            if self._fill(grid):
+                return True
+            grid.remove(row, col)
 
         return False
 
     def find_empty_location(self, board):
         """Find an empty cell (0) on the board."""
-        for i in range(9):
-            for j in range(9):
+        for i in range(self.size):
+            for j in range(self.size):
                 if board[i][j] == 0:
                     return (i, j)
         return None
 
     def generate_full_board(self):
         """Create a fully solved valid Sudoku board."""
-        self.solve(self.board)
-        self.solution = copy.deepcopy(self.board)  # Store a copy of the full solution
+        if self.size <= 9:
+            self.solve(self.board)
+        else:
+            # Random backtracking has a heavy tail on 16x16 and larger grids, so start
+            # from a valid pattern and shuffle it instead
+            self.board = self._shuffled_pattern_board()
+        self.solution = self.board.copy()  # Store a copy of the full solution
 
-    def count_solutions(self, board):
-        """Count the number of solutions a Sudoku board has."""
-        board_copy = copy.deepcopy(board)
-        return self._count_solutions_helper(board_copy)
+    def _shuffled_pattern_board(self):
+        """Build a solved board from the standard shifted pattern, randomized by a random symmetry transform."""
+        box, size = self.box, self.size
+        pattern = Board(size, [(box * (r % box) + r // box + c) % size + 1 for r in range(size) for c in range(size)])
+        return Transform.random(size, self.rng).apply(pattern)
 
-    def _count_solutions_helper(self, board):
-        """Recursive helper to count solutions."""
-        empty = self.find_empty_location(board)
-        if not empty:
-            return 1  # Found a valid solution
-
-        row, col = empty
-        count = 0
-
-        for num in range(1, 10):
-            if self.is_valid(board, row, col, num):
-                board[row][col] = num
-                count += self._count_solutions_helper(board)
-                if count > 1:  # Stop early if more than one solution exists
-                    return count
-                board[row][col] = 0
-
-        return count
-
-    def remove_numbers(self):
-        """Remove numbers while ensuring a unique solution."""
-        attempts = self.empty_cells
-        while attempts > 0:
-            row, col = random.randint(0, 8), random.randint(0, 8)
-            while self.board[row][col] == 0:  # Ensure we remove an actual number
-                row, col = random.randint(0, 8), random.randint(0, 8)
-
-            backup = self.board[row][col]
-            self.board[row][col] = 0
-
-            # Check if the puzzle still has a unique solution
-            if self.count_solutions(self.board) != 1:
-                self.board[row][col] = backup  # Restore if removing makes it ambiguous
+    def count_solutions(self, board):
+        """Count the number of solutions a Sudoku board has (stops counting at 2)."""
+        return count_solutions(as_board(board), limit=2)
+
+    def remove_numbers(self, minimal=False):
+        """
+        Dig holes while keeping a unique solution: one pass over the filled cells in
+        shuffled order (no random retries), stopping at 'empty_cells' holes or as soon
+        as the cells left can no longer reach it. With 'symmetric' set, a cell and its
+        180-degree partner are removed together. With 'minimal', every cell that can
+        go is removed, whatever 'empty_cells' says. Returns the number of empty cells.
+        """
+        size = self.size
+        target = size * size if minimal else self.empty_cells
+        grid = CandidateGrid(self.board)
+        solution = self.solution or self.board.copy()
+
+        # A cell is only removable if no other solution agrees with every clue left. Clues
+        # only go away, so a cell proven necessary stays necessary: one visit per cell is enough
+        order = [index for index in range(size * size) if self.board.cells[index] != 0]
+        self.rng.shuffle(order)
+        if self.symmetric:
+            groups, seen = [], set()
+            for index in order:
+                if index not in seen:
+                    group = sorted({index, size * size - 1 - index})
+                    seen.update(group)
+                    groups.append(group)
+        else:
+            groups = [[index] for index in order]
+
+        removed = sum(1 for num in self.board.cells if num == 0)
+        left = len(order)
+        for group in groups:
+            if removed >= target or (not minimal and removed + left < target):
+                break  # Target reached, or no longer reachable with the cells left
+            left -= len(group)
+            if removed + len(group) > target:
+                continue  # Would overshoot; a smaller group further on may still fit
+
+            for index in group:
+                grid.remove(*divmod(index, size))
+            # Any new solution must differ from the known one in a cell just removed
+            if all(is_forced(grid, index // size, index % size, solution.cells[index], self.max_nodes) for index in group):
+                removed += len(group)
             else:
-                attempts -= 1
-
-    def generate_sudoku(self):
-        """Create a full Sudoku board, then remove numbers to make a puzzle."""
-        self.generate_full_board()
-        self.remove_numbers()
+                for index in group:
+                    grid.place(index // size, index % size, solution.cells[index])
+        return removed
+
+    def generate_sudoku(self, max_attempts=None):
+        """
+        Create a full Sudoku board, then remove numbers to make a puzzle. A pass that
+        falls short of 'empty_cells' starts over from a new full board, up to
+        'max_attempts' times (10, or 1 when proofs are capped by 'max_nodes' and
+        retries rarely help); if all fall short, the puzzle with the most empty cells
+        is returned with a RuntimeWarning.
+        """
+        if self.rated:
+            return self.generate_rated()
+        if max_attempts is None:
+            max_attempts = 10 if self.max_nodes is None else 1
+        best = None
+        for _ in range(max_attempts):
+            self.board = Board(self.size)
+            self.generate_full_board()
+            holes = self.remove_numbers()
+            if holes >= self.empty_cells:
+                return self.board
+            if best is None or holes > best[0]:
+                best = holes, self.board, self.solution
+        holes, self.board, self.solution = best
+        warnings.warn(f"Only {holes} of {self.empty_cells} empty cells for difficulty {self.difficulty!r} "
+                      f"after {max_attempts} attempts", RuntimeWarning, stacklevel=2)
         return self.board
 
+    def generate_rated(self, max_attempts=100):
+        """
+        Create a puzzle whose technique rating (see sudoku.rater) falls in the
+        'difficulty' band: dig a minimal puzzle, then give clues back from the
+        solution until it is no harder than the band. Raises RuntimeError if no
+        attempt lands in the band.
+        """
+        bands = [name for name, _ in BANDS]
+        target = bands.index(self.difficulty)
+        for _ in range(max_attempts):
+            self.board = Board(self.size)
+            self.generate_full_board()
+            self.remove_numbers(minimal=True)
+            band = bands.index(difficulty_of(self.board))
+            holes = [index for index, num in enumerate(self.board.cells) if num == 0]
+            self.rng.shuffle(holes)
+            while band > target and holes:
+                index = holes.pop()
+                self.board.cells[index] = self.solution.cells[index]  # Extra clues keep it unique
+                band = bands.index(difficulty_of(self.board))
+            if band == target:
+                self.rating = rate(self.board)
+                return self.board
+        raise RuntimeError(f"No {self.difficulty} puzzle found in {max_attempts} attempts")
+
     def print_board(self, board=None, title="Generated Sudoku Puzzle"):
         """Print the Sudoku board in a readable format."""
-        board = board or self.board
-        print(f"\n{title}:")
-        for row in board:
-            print(" ".join(str(num) if num != 0 else "*" for num in row))
+        print_board(board or self.board, title)
 
     def solution_board(self):
         """Return or print the full solution before numbers were removed."""
@@ -120,8 +204,41 @@ class SudokuGenerator:
             print("No solution available. Generate a puzzle first.")
 
 
+def print_board(board, title="Generated Sudoku Puzzle"):
+    """Print any board in a readable format, '*' for empty cells."""
+    width = len(str(len(board)))  # Keep columns aligned on 16x16 and larger boards
+    print(f"\n{title}:")
+    for row in board:
+        print(" ".join((str(num) if num != 0 else "*").rjust(width) for num in row))
+
+
+def _generate_one(job):
+    """Generate a single puzzle for generate_many(); runs inside a worker process."""
+    index, difficulty, seed, size, symmetric, rated = job
+    # Seeded per puzzle, not per process, so the output does not depend on the worker count
+    generator = SudokuGenerator(difficulty, size=size, symmetric=symmetric, rated=rated, seed=f"{seed}:{index}")
+    puzzle = generator.generate_sudoku()
+    return index, puzzle, generator.solution
+
+
+def generate_many(n, difficulty="medium", seed=None, workers=None, size=9, symmetric=False, rated=False,
+                  chunksize=4, ordered=True):
+    """
+    Generate 'n' puzzles across a process pool, yielding (index, puzzle, solution)
+    Boards as they are produced. Puzzle i only depends on (seed, i), so the same
+    seed gives the same puzzles whatever 'workers' is. With ordered=False results
+    come back in completion order. workers=1 generates in this process without a pool.
+    """
+    if rated and difficulty not in dict(BANDS):
+        raise ValueError(f"Unknown difficulty '{difficulty}', expected one of: {', '.join(dict(BANDS))}")
+    if seed is None:
+        seed = random.randrange(2 ** 63)  # Drawn now, not when the first puzzle is asked for
+    jobs = ((index, difficulty, seed, size, symmetric, rated) for index in range(n))
+    return run_jobs(_generate_one, jobs, workers, chunksize, ordered)
+
+
 if __name__ == '__main__':
-    # Example Usage
+    # Example Usage: `python -m sudoku.generator` from the repository root
     generator = SudokuGenerator(difficulty="hard")
     sudoku_puzzle = generator.generate_sudoku()
     generator.print_board()
@@ -0,0 +1,192 @@
+import hashlib
+import random
+import re
+import time
+
+from sudoku.board import Board
+from sudoku.candidates import CandidateGrid
+from sudoku.config import LLM_BACKEND, MODEL_PATH
+
+
+class LlamaBackend:
+    """
+    llama.cpp chat model. Nothing is imported or loaded until the first request,
+    so importing the solver costs nothing when no LLM solve happens.
+
+    Requests that declare the same 'prefix' (the static start of their prompt)
+    share its KV state: the backend learns the tokens those prompts have in common,
+    evaluates them once and saves the llama.cpp state. llama.cpp already skips the
+    tokens a new prompt shares with the context; the saved state is restored when
+    another prompt has overwritten the context in between.
+    """
+    def __init__(self, model_path=MODEL_PATH, chat_format='chat-format', n_batch=4096, n_ctx=4096):
+        self.model_path = model_path
+        self.model_id = f"llama:{model_path}"  # Identifies the model in caches and telemetry
+        self.options = {"chat_format": chat_format, "n_batch": n_batch, "n_ctx": n_ctx}
+        self._llm = None
+        self._prefixes = {}  # prefix -> [common token ids, saved state or None]
+
+    @property
+    def llm(self):
+        """The llama_cpp.Llama instance, loaded on first use."""
+        if self._llm is None:
+            from llama_cpp import Llama  # Optional dependency, only needed for real LLM solves
+            self._llm = Llama(self.model_path, verbose=False, **self.options)
+        return self._llm
+
+    def chat(self, messages, temperature=0.5, grammar=None, prefix=None, max_tokens=None):
+        """
+        Run a chat completion; returns an OpenAI-style response dict.
+        'grammar' is a GBNF string the output must match; 'prefix' names the static
+        start of the prompt so its evaluated state can be reused (see the class docstring).
+        'max_tokens' caps the answer (the caller knows how many moves it asked for).
+        The completion is streamed so the response can also carry "timings": the time
+        to the first token (prompt evaluation) and the rest (generation), in ms.
+        """
+        options = {}
+        if grammar:
+            from llama_cpp import LlamaGrammar
+            options["grammar"] = LlamaGrammar.from_string(grammar, verbose=False)
+        if max_tokens:
+            options["max_tokens"] = max_tokens
+        llm = self.llm
+        known = self._prefixes.get(prefix) if prefix is not None else None
+        if known and known[1] is not None and list(llm.input_ids[:len(known[0])]) != known[0]:
+            llm.load_state(known[1])  # Another prompt used the context: bring the prefix back
+        start = time.perf_counter()
+        first, pieces = None, []
+        for chunk in llm.create_chat_completion(messages=messages, temperature=temperature, stream=True, **options):
+            piece = chunk["choices"][0]["delta"].get("content")
+            if piece:
+                if first is None:
+                    first = time.perf_counter()
+                pieces.append(piece)  # One chunk per generated token
+        end = time.perf_counter()
+        first = first or end
+        response = {
+            "choices": [{"message": {"role": "assistant", "content": "".join(pieces)}}],
+            # Streaming reports no usage: the context holds the prompt and all but the last generated token
+            # (read before _learn_prefix(), which may reset the context to the prefix alone)
+            "usage": {"prompt_tokens": max(llm.n_tokens - len(pieces) + 1, 0), "completion_tokens": len(pieces)},
+            "timings": {"prompt_ms": (first - start) * 1000, "generation_ms": (end - first) * 1000},
+        }
+        if prefix is not None:
+            self._learn_prefix(prefix, [int(token) for token in llm.input_ids[:llm.n_tokens]])
+        return response
+
+    def chat_batch(self, requests):
+        """
+        Answer a batch of chat() keyword-argument dicts, in order. llama-cpp-python
+        evaluates one sequence per context, so the batch runs back to back; the
+        requests share their prefix state, so each one only evaluates its own board part.
+        """
+        return [self.chat(**request) for request in requests]
+
+    def _learn_prefix(self, prefix, tokens):
+        """Shrink the prefix's token ids to what 'tokens' shares with them, and snapshot the result."""
+        if prefix not in self._prefixes:
+            self._prefixes[prefix] = [tokens, None]  # One prompt alone does not tell which part is static
+            return
+        known = self._prefixes[prefix]
+        common = 0
+        for old, new in zip(known[0], tokens):
+            if old != new:
+                break
+            common += 1
+        if common < len(known[0]):
+            # Usually settles after a few steps, once the first board rows have changed too
+            known[0], known[1] = known[0][:common], None
+        if known[1] is None and known[0]:
+            llm = self.llm
+            llm.reset()
+            llm.eval(known[0])
+            known[1] = llm.save_state()
+
+
+class FakeBackend:
+    """
+    Deterministic stand-in for a model, for tests and benchmarks of the ToT loop
+    without a model file. It reads the board back from the prompt and answers with
+    a move on the most constrained empty cell, picking among its candidates with a
+    hash of the prompt and the call number, so a run replays exactly.
+    'mistakes' is the share of answers replaced by an illegal move; with a
+    grammar the answer is always one of the moves it allows.
+    """
+    def __init__(self, seed=0, mistakes=0.0):
+        self.seed = seed
+        self.mistakes = mistakes
+        self.model_id = f"fake:{seed}:{mistakes}"
+        self.calls = 0
+
+    def chat(self, messages, temperature=0.5, grammar=None, prefix=None, max_tokens=None):
+        prompt = messages[-1]["content"]
+        self.calls += 1
+        rng = random.Random(hashlib.sha1(f"{self.seed}:{self.calls}:{temperature}:{prompt}".encode()).digest())
+        board = board_from_prompt(prompt)
+        empty = CandidateGrid(board).best_cell() if board else None
+        allowed = re.findall(r'"(\(\d+, \d+, \d+\))"', grammar) if grammar else None
+        if allowed:
+            # Stay inside the grammar: as many moves as it allows, most constrained cell first
+            count = 1 + grammar.count('("\\n" move)?')
+            best = [move for move in allowed if empty and move.startswith(f"({empty[0]}, {empty[1]},")]
+            rest = [move for move in allowed if move not in best]
+            rng.shuffle(best)
+            rng.shuffle(rest)
+            content = "\n".join((best + rest)[:count])
+        elif empty is None:
+            content = "(0, 0, 0)"  # Nothing sensible to propose
+        elif rng.random() < self.mistakes:
+            content = f"({empty[0]}, {empty[1]}, 0)"
+        else:
+            row, col, mask = empty
+            nums = [num for num in range(1, board.size + 1) if mask >> num & 1] or [1]
+            content = f"({row}, {col}, {rng.choice(nums)})"
+        return {
+            "choices": [{"message": {"role": "assistant", "content": content}}],
+            # Rough token counts (about 4 characters per token) so telemetry has something to show
+            "usage": {"prompt_tokens": sum(len(message["content"]) for message in messages) // 4,
+                      "completion_tokens": len(content) // 4},
+        }
+
+    def chat_batch(self, requests):
+        return [self.chat(**request) for request in requests]
+
+
+def board_from_prompt(prompt):
+    """Recover the board from a prompt written by LlmSudokuSolver (one line of N cells per row)."""
+    lines = [line.strip() for line in prompt.splitlines()]
+    for start, line in enumerate(lines):
+        size = len(line)
+        rows = lines[start:start + size]
+        if size > 1 and len(rows) == size and all(len(row) == size and re.fullmatch(r"[.0-9A-P]+", row) for row in rows):
+            try:
+                return Board.from_line("".join(rows))
+            except ValueError:
+                continue  # Not a square board after all
+    return None
+
+
+# Model backends selectable by name, e.g. LLM_BACKEND in config.py
+BACKENDS = {
+    "llama": LlamaBackend,
+    "fake": FakeBackend,
+}
+
+_SHARED = {}
+
+
+def get_backend(backend=None):
+    """
+    Return the process-wide shared backend for a name (LLM_BACKEND from config.py by
+    default), so every solver in the process uses one loaded model. A backend
+    object is returned as is.
+    """
+    if backend is None:
+        backend = LLM_BACKEND
+    if not isinstance(backend, str):
+        return backend
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown LLM backend '{backend}', choose from: {', '.join(BACKENDS)}")
+    if backend not in _SHARED:
+        _SHARED[backend] = BACKENDS[backend]()
+    return _SHARED[backend]
@@ -0,0 +1,104 @@
+import hashlib
+import json
+import sqlite3
+import time
+from collections import OrderedDict
+
+from sudoku.config import LLM_CACHE_PATH
+
+
+def request_key(model_id, version, request, repeat=0):
+    """
+    Cache key of a chat request: a hash of the model, the prompt template version
+    and the whole request (board and candidates in the prompt, sampling
+    parameters, grammar). 'repeat' counts earlier identical requests of the same
+    solve, so a retry gets a fresh answer while a replayed run hits every time.
+    """
+    text = json.dumps([model_id, version, request, repeat], sort_keys=True)
+    return hashlib.sha256(text.encode()).hexdigest()
+
+
+_SHARED = {}
+
+
+def make_llm_cache(cache):
+    """Normalize a solver's 'llm_cache' argument: None/False, True (default file), a database path or a MoveCache."""
+    if cache is None or cache is False:
+        return None
+    if cache is True:
+        cache = LLM_CACHE_PATH
+    if isinstance(cache, str):
+        if cache not in _SHARED:
+            _SHARED[cache] = MoveCache(cache)  # One connection per file and process
+        return _SHARED[cache]
+    return cache
+
+
+class MoveCache:
+    """
+    Persistent request -> LLM response store: an in-memory LRU of the last
+    'memory_entries' responses in front of a SQLite table that is kept under
+    'max_bytes' of responses by dropping the least recently used ones.
+    With 'bypass' set, lookups always miss (for sampling diversity) but new
+    responses are still stored.
+    """
+    def __init__(self, path=LLM_CACHE_PATH, max_bytes=64 * 1024 * 1024, memory_entries=4096, bypass=False):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.memory_entries = memory_entries
+        self.bypass = bypass
+        self.memory = OrderedDict()  # key -> response, most recently used last
+        self.db = sqlite3.connect(path)
+        self.db.execute("CREATE TABLE IF NOT EXISTS responses "
+                        "(key TEXT PRIMARY KEY, response TEXT NOT NULL, size INTEGER NOT NULL, used REAL NOT NULL)")
+        self.db.execute("CREATE INDEX IF NOT EXISTS responses_used ON responses (used)")
+        self.db.commit()
+        self.size = self.db.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        self._evict()  # 'max_bytes' may be smaller than last time
+
+    def get(self, key):
+        """Return the cached response dict for a request_key(), or None."""
+        if self.bypass:
+            return None
+        if key in self.memory:
+            self.memory.move_to_end(key)
+            return self.memory[key]
+        row = self.db.execute("SELECT response FROM responses WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        self.db.execute("UPDATE responses SET used = ? WHERE key = ?", (time.time(), key))
+        self.db.commit()
+        response = json.loads(row[0])
+        self._remember(key, response)
+        return response
+
+    def put(self, key, response):
+        """Store a response under a request_key(), evicting old entries past 'max_bytes'."""
+        text = json.dumps(response)
+        old = self.db.execute("SELECT size FROM responses WHERE key = ?", (key,)).fetchone()
+        self.db.execute("INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?)", (key, text, len(text), time.time()))
+        self.size += len(text) - (old[0] if old else 0)
+        self._evict()
+        self._remember(key, response)
+
+    def _evict(self):
+        """Drop the least recently used responses until the table fits in 'max_bytes'."""
+        while self.size > self.max_bytes:
+            rows = self.db.execute("SELECT key, size FROM responses ORDER BY used LIMIT 64").fetchall()
+            if not rows:
+                self.size = 0
+                break
+            self.db.executemany("DELETE FROM responses WHERE key = ?", [(old_key,) for old_key, _ in rows])
+            for old_key, size in rows:
+                self.memory.pop(old_key, None)
+                self.size -= size
+        self.db.commit()
+
+    def _remember(self, key, response):
+        self.memory[key] = response
+        self.memory.move_to_end(key)
+        if len(self.memory) > self.memory_entries:
+            self.memory.popitem(last=False)
+
+    def __len__(self):
+        return self.db.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
@@ -0,0 +1,115 @@
+import asyncio
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from sudoku.llm_backend import get_backend
+from sudoku.llm_solver import LlmSudokuSolver
+
+
+class LlmScheduler:
+    """
+    Run the ToT searches of many puzzles at once on one shared backend.
+
+    Every puzzle is an asyncio task that drives LlmSudokuSolver.tot_steps() and puts
+    each move request on a bounded queue. A single dispatcher takes up to
+    'batch_size' waiting requests at a time and hands them to backend.chat_batch()
+    in a worker thread, so the event loop keeps doing the other puzzles' bookkeeping
+    (applying moves, propagating, building prompts) while the model runs.
+    Backpressure: at most 'max_pending' requests wait in the queue and at most
+    'concurrency' searches are in progress; the others wait their turn.
+    """
+    def __init__(self, backend=None, batch_size=8, max_pending=32, concurrency=16):
+        self.backend = get_backend(backend)
+        self.batch_size = batch_size
+        self.max_pending = max_pending
+        self.concurrency = concurrency
+
+    def solve_all(self, puzzles, max_steps=100, search="chain", width=3, proposals=3, **options):
+        """Blocking wrapper around solve(); returns the results in puzzle order."""
+        return asyncio.run(self.solve(puzzles, max_steps, search, width, proposals, **options))
+
+    async def solve(self, puzzles, max_steps=100, search="chain", width=3, proposals=3, **options):
+        """
+        Solve every puzzle and return the solve_with_tot() results in puzzle order.
+        'max_steps' is the LLM call budget of each puzzle: one number for all, or one per puzzle.
+        Other keyword arguments go to LlmSudokuSolver (cache, llm_cache, telemetry, constrained,
+        presolve, verbose); the solvers are quiet unless verbose=True is passed.
+        A puzzle whose request fails in the backend gets a "Failed: ..." string as its result.
+        """
+        options.setdefault("verbose", False)  # Interleaved step output of many puzzles is unreadable
+        puzzles = list(puzzles)
+        budgets = [max_steps] * len(puzzles) if isinstance(max_steps, int) else list(max_steps)
+        if len(budgets) != len(puzzles):
+            raise ValueError("max_steps needs one budget per puzzle")
+        queue = asyncio.Queue(self.max_pending)
+        slots = asyncio.Semaphore(self.concurrency)
+        # One thread: the model is not thread-safe, and one sequence at a time keeps it busy
+        with ThreadPoolExecutor(max_workers=1, thread_name_prefix="llm") as executor:
+            dispatcher = asyncio.ensure_future(self._dispatch(queue, executor))
+            try:
+                return await asyncio.gather(*(
+                    self._solve_one(puzzle, budget, queue, slots, (search, width, proposals), options)
+                    for puzzle, budget in zip(puzzles, budgets)))
+            finally:
+                dispatcher.cancel()
+
+    async def _solve_one(self, puzzle, budget, queue, slots, search, options):
+        """Drive one puzzle's search, awaiting the answer to each of its requests."""
+        async with slots:
+            loop = asyncio.get_running_loop()
+            solver = LlmSudokuSolver(puzzle, backend=self.backend, **options)
+            steps = solver.tot_steps(budget, *search)
+            try:
+                request = next(steps)
+                while True:
+                    start = time.perf_counter()
+                    key, response = solver.lookup(request)
+                    cached = response is not None
+                    if not cached:  # Only cache misses go to the model
+                        answer = loop.create_future()
+                        await queue.put((request, answer))  # Waits while the queue is full
+                        response = await answer
+                        solver.remember(key, response)
+                    # Latency includes the time spent queued behind other puzzles' requests
+                    solver.record_step(response, time.perf_counter() - start, cached)
+                    request = steps.send(response)
+            except StopIteration as done:
+                return done.value
+            except Exception as error:  # E.g. the backend failed on this puzzle's batch
+                return f"Failed: {error!r}"
+
+    async def _dispatch(self, queue, executor):
+        """Send the waiting requests to the backend in batches, one batch at a time."""
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await queue.get()]
+            while len(batch) < self.batch_size and not queue.empty():
+                batch.append(queue.get_nowait())
+            requests = [request for request, _ in batch]
+            try:
+                responses = await loop.run_in_executor(executor, self.backend.chat_batch, requests)
+            except asyncio.CancelledError:
+                raise
+            except Exception as error:
+                for _, answer in batch:
+                    if not answer.done():
+                        answer.set_exception(error)  # Fails the puzzles of this batch, not the rest
+                continue
+            for (_, answer), response in zip(batch, responses):
+                if not answer.done():
+                    answer.set_result(response)
+
+
+if __name__ == "__main__":
+    # Solve a few generated puzzles together, e.g. `python -m sudoku.llm_scheduler fake 8`
+    from sudoku.generator import SudokuGenerator
+
+    backend = sys.argv[1] if len(sys.argv) > 1 else None
+    count = int(sys.argv[2]) if len(sys.argv) > 2 else 8
+    puzzles = [SudokuGenerator("hard", seed=index).generate_sudoku() for index in range(count)]
+    scheduler = LlmScheduler(backend)
+    start = time.perf_counter()
+    results = scheduler.solve_all(puzzles, search="best")
+    solved = sum(1 for result in results if not isinstance(result, str))
+    print(f"✅ Solved {solved}/{count} puzzles in {time.perf_counter() - start:.2f}s")
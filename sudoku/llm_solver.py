@@ -1,46 +1,101 @@
-import copy
+import heapq
+import math
+import random
 import re
-from llama_cpp import Llama
-from config import MODEL_PATH
+import time
+from itertools import count as counter
+from sudoku.board import as_board
+from sudoku.candidates import CandidateGrid, digits_of
+from sudoku.solution_cache import make_cache
+from sudoku.llm_backend import get_backend
+from sudoku.llm_cache import make_llm_cache, request_key
+from sudoku.telemetry import make_sink
 
-llm = Llama(
-    MODEL_PATH,
-    chat_format='chat-format',
-    n_batch=4096,
-    n_ctx=4096,
-    max_tokens = 4096,# None unlimited tokens
-    verbose = False)
 
+_ZOBRIST = {}
+
+def zobrist(size):
+    """Random 64-bit key of every (flat cell index, number) for an NxN board; a board's key is the XOR of its filled cells' keys."""
+    if size not in _ZOBRIST:
+        rng = random.Random(size)  # Fixed seed: keys are stable from run to run
+        _ZOBRIST[size] = [[rng.getrandbits(64) for _ in range(size + 1)] for _ in range(size * size)]
+    return _ZOBRIST[size]
 
 class TreeNode:
-    """Node in the search tree representing a partially solved Sudoku board."""
-    def __init__(self, board, parent=None):
-        self.board = copy.deepcopy(board)  # Deep copy to avoid mutation
+    """
+    Node in the search tree representing a partially solved Sudoku board.
+    Only the root keeps a board; every other node keeps the moves that lead to it
+    from its parent (the LLM move plus the cells it forced), and the board is
+    rebuilt on demand. 'key' is a Zobrist hash of the board, updated per move.
+    """
+    __slots__ = ("root_board", "moves", "children", "parent", "size", "key", "empty", "value")
+
+    def __init__(self, board=None, parent=None, moves=()):
+        self.moves = tuple(moves)  # (row, col, num) placed on top of the parent's board
         self.children = []
         self.parent = parent
-
-    def add_child(self, board):
-        """Create and return a new child node."""
-        child = TreeNode(board, parent=self)
+        self.value = 0.0  # Heuristic score used by the beam and best-first searches
+        if parent is None:
+            self.root_board = as_board(board).copy()  # Own copy to avoid mutation (one bytes copy)
+            self.size = size = len(self.root_board)
+            keys = zobrist(size)
+            self.key = 0
+            for index, num in enumerate(self.root_board.cells):
+                if num:
+                    self.key ^= keys[index][num]
+            self.empty = self.root_board.cells.count(0)
+        else:
+            self.root_board = None
+            self.size = size = parent.size
+            keys = zobrist(size)
+            self.key = parent.key
+            for row, col, num in self.moves:
+                self.key ^= keys[row * size + col][num]
+            self.empty = parent.empty - len(self.moves)
+
+    @property
+    def board(self):
+        """A fresh copy of the node's board: the root board with the moves of the path placed on it."""
+        path, node = [], self
+        while node.parent is not None:
+            path.append(node.moves)
+            node = node.parent
+        board = node.root_board.copy()
+        for moves in path:
+            for row, col, num in moves:
+                board[row, col] = num
+        return board
+
+    def add_child(self, moves):
+        """Create and return a new child node for the board after 'moves'."""
+        child = TreeNode(parent=self, moves=moves)
         self.children.append(child)
         return child
 
 class ToTController:
     """Manages backtracking and stopping criteria."""
+    max_attempts = 5  # Failed attempts at one node before giving up on it
+
     def should_backtrack(self, node):
         """Decide if we need to backtrack based on ToT rules."""
         if not is_valid_sudoku(node.board):  # Invalid board
             return True
-        if len(node.children) > 5:  # Too many failed attempts
+        if len(node.children) > self.max_attempts:  # Too many failed attempts
             return True
         return False
 
+    def should_retry(self, attempts):
+        """Decide if a tree search node whose expansions gave no usable child 'attempts' times is asked again."""
+        return attempts <= self.max_attempts
+
 def is_valid_sudoku(board):
-    """Check if the board follows Sudoku rules (row, col, and 3x3 grid)."""
-    for i in range(9):
+    """Check if the board follows Sudoku rules (row, col, and box grid) for any NxN size."""
+    size = len(board)
+    box = math.isqrt(size)
+    for i in range(size):
         row_vals = set()
         col_vals = set()
-        for j in range(9):
+        for j in range(size):
             if board[i][j] != 0:
                 if board[i][j] in row_vals:
                     return False
@@ -51,12 +106,12 @@ def is_valid_sudoku(board):
                     return False
                 col_vals.add(board[j][i])
 
-    for box_row in range(3):
-        for box_col in range(3):
+    for box_row in range(box):
+        for box_col in range(box):
             seen = set()
-            for i in range(3):
-                for j in range(3):
-                    num = board[box_row * 3 + i][box_col * 3 + j]
+            for i in range(box):
+                for j in range(box):
+                    num = board[box_row * box + i][box_col * box + j]
                     if num != 0:
                         if num in seen:
                             return False
@@ -64,84 +119,443 @@ def is_valid_sudoku(board):
 
     return True
 
+# Static start of every move prompt. Keeping it byte-identical and first lets the
+# backend evaluate it once and reuse its KV state for every step and puzzle.
+PROMPT_PREFIX = """You are an expert Sudoku solver. Suggest moves for the Sudoku board below.
+Rules:
+- Write each move strictly as (row, col, num) with 0-based row and column, no explanations.
+- The move must follow Sudoku rules (no duplicates in row, column, or box).
+- Only use a number listed as legal for that cell.
+Board rows are written top to bottom, one character per cell, '.' for empty, A-P for 10-25.
+Example answer: (2, 3, 5)
+"""
+
+# Token budget per move of a constrained answer: "(12, 15, 9)" plus the newline is about
+# 10 tokens with most tokenizers, so several moves, or 16x16 coordinates, are never cut off
+MOVE_TOKENS = 12
+
+# Bump whenever the prompt wording or layout changes, so cached LLM answers to the old prompt are not reused
+PROMPT_VERSION = 2  # 2: answers capped per requested move (max_tokens)
+
+def encode_board(board):
+    """Compact board text: one line per row, one character per cell (about one token each)."""
+    line = board.to_line(".")
+    size = len(board)
+    return "\n".join(line[start:start + size] for start in range(0, size * size, size))
+
+def encode_moves(moves):
+    """Compact candidate list, one 'row,col:numbers' line per empty cell."""
+    glue = "" if all(num < 10 for nums in moves.values() for num in nums) else " "
+    return "\n".join(f"{row},{col}:{glue.join(map(str, nums))}" for (row, col), nums in moves.items())
+
+def move_grammar(moves, count=1):
+    """llama.cpp GBNF grammar that only accepts 1 to 'count' legal moves '(row, col, num)', one per line."""
+    alternatives = " | ".join(f'"({row}, {col}, {num})"' for (row, col), nums in moves.items() for num in nums)
+    more = ' ("\\n" move)?' * (count - 1)  # Each optional extra move starts on a new line
+    return f"root ::= move{more}\nmove ::= {alternatives}\n"
+
+def board_value(board):
+    """
+    Value heuristic for tree search: minus the log of the number of candidate
+    combinations left once naked and hidden singles are filled in on a scratch
+    copy (with pointing pairs), so boards with fewer and more constrained empty cells rank first.
+    A contradiction found on the way is -inf (dead end); a solved board is 0.
+    """
+    grid = CandidateGrid(as_board(board).copy())
+    if not grid.propagate([]):
+        return -math.inf
+    size = grid.size
+    return -sum(math.log(len(digits_of(grid.candidates(row, col))))
+                for row in range(size) for col in range(size) if grid.cells[row * size + col] == 0)
+
+# Counters in LlmSudokuSolver.stats that a step event reports as its own share: what its answer led to
+STEP_OUTCOMES = ("parse_failures", "rule_violations", "backtracks", "dead_ends")
+
+def response_text(response):
+    """The stripped message text of a chat completion response."""
+    return response["choices"][0]["message"]["content"].strip()
+
 class LlmSudokuSolver:
-    def __init__(self, board):
+    def __init__(self, board, cache=None, backend=None, constrained=True, presolve=True, llm_cache=None,
+                 telemetry=None, verbose=True):
         self.root = TreeNode(board)  # Root node
+        self.puzzle = self.root.board.copy()  # The root board gets its forced cells filled in
         self.current_node = self.root
         self.controller = ToTController()
+        self.constrained = constrained  # Decode with a grammar that only allows legal moves
+        self.presolve = presolve  # Fill forced cells symbolically, the LLM only decides real choices
+        self.verbose = verbose  # Print the step-by-step progress (off when many puzzles run at once)
+        self.backend = get_backend(backend)  # Shared per process; the model itself loads on the first prompt
+        self.cache = make_cache(cache)  # Solutions keyed by canonical form, off unless requested
+        self.llm_cache = make_llm_cache(llm_cache)  # LLM answers keyed by request, off unless requested
+        self.asked = {}  # Times each request was sent during this solve, see request_key()
+        self.telemetry = make_sink(telemetry)  # Per-step and per-solve metrics, see telemetry.py
+        self.pending_step = None  # Step event waiting for the outcome of its answer, see record_step()
+        self.stats = dict.fromkeys(("llm_calls", "cache_hits", "prompt_tokens", "completion_tokens",
+                                    "parse_failures", "rule_violations", "backtracks", "dead_ends"), 0)
+        # Transposition table: Zobrist keys of every board reached, and of those known to fail
+        self.visited = set()
+        self.dead = set()
 
     def find_empty_location(self, board):
         """Find an empty cell (0) in the board."""
-        for i in range(9):
-            for j in range(9):
+        for i in range(len(board)):
+            for j in range(len(board)):
                 if board[i][j] == 0:
                     return i, j
         return None
 
-    def prompt_llm(self, board):
-        """Use LLM to suggest the next best move with a structured response."""
-        prompt = f"""
-        You are an expert Sudoku solver. Your task is to suggest a single valid move for the given Sudoku board.
-        
-        Sudoku Board:
-        {board}
-
-        Rules:
-        - Format your response strictly as: `(row, col, num)`
-        - Ensure the move follows Sudoku rules (no duplicates in row, column, or 3x3 box).
-        - Do **not** provide explanations—only output a tuple in the exact format `(row, col, num)`.
-
-        Example Response:
-        ```
-        (2, 3, 5)
-        ```
+    def legal_moves(self, board):
+        """Map every empty cell (row, col) to the numbers that can legally go there."""
+        grid = CandidateGrid(board)
+        size = len(board)
+        return {(row, col): digits_of(grid.candidates(row, col))
+                for row in range(size) for col in range(size) if board[row, col] == 0}
+
+    def fill_forced(self, board):
+        """
+        Fill every cell forced by naked and hidden singles into 'board' in place (if
+        'presolve'). Returns the filled (row, col, num) moves, or None if the board
+        turns out to have no solution.
         """
-        response = llm.create_chat_completion(
-            messages=[
+        placed = []
+        if self.presolve and not CandidateGrid(board).propagate(placed, pointing=False):
+            return None
+        return placed
+
+    def prompt_llm(self, board, moves=None, count=1):
+        """
+        Use LLM to suggest the next best move with a structured response
+        ('count' > 1 asks for that many moves, best first, one per line).
+        With 'moves' (see legal_moves()) the candidates are listed in the prompt and,
+        if 'constrained', decoding is restricted to exactly those moves.
+        """
+        return response_text(self.ask(self.move_request(board, moves, count)))
+
+    def ask(self, request):
+        """Send one request to the backend, answering it from the move cache when possible."""
+        start = time.perf_counter()
+        key, response = self.lookup(request)
+        cached = response is not None
+        if not cached:
+            response = self.backend.chat(**request)
+            self.remember(key, response)
+        self.record_step(response, time.perf_counter() - start, cached)
+        return response
+
+    def record_step(self, response, seconds, cached):
+        """
+        Count one answered request and prepare its 'step' event for the telemetry sink:
+        token counts from the response's usage, the request latency, and the
+        backend's prompt-eval/generation split when it reports one ("timings").
+        The event is sent once the answer has been used (see flush_step()), with
+        the STEP_OUTCOMES counts it caused, so failing steps can be told apart.
+        """
+        stats = self.stats
+        stats["cache_hits" if cached else "llm_calls"] += 1
+        usage = {} if cached else response.get("usage") or {}  # A cache hit spends no tokens
+        timings = {} if cached else response.get("timings") or {}
+        stats["prompt_tokens"] += usage.get("prompt_tokens") or 0
+        stats["completion_tokens"] += usage.get("completion_tokens") or 0
+        self.flush_step()
+        if self.telemetry is not None:
+            self.pending_step = ({
+                "event": "step", "puzzle": self.puzzle.to_line(), "model": self.backend.model_id,
+                "step": stats["llm_calls"] + stats["cache_hits"], "cached": cached,
+                "prompt_tokens": usage.get("prompt_tokens"), "completion_tokens": usage.get("completion_tokens"),
+                "latency_ms": seconds * 1000, "prompt_eval_ms": timings.get("prompt_ms"),
+                "generation_ms": timings.get("generation_ms"),
+            }, {name: stats[name] for name in STEP_OUTCOMES})
+
+    def flush_step(self):
+        """Send the waiting step event, with the change of the STEP_OUTCOMES counters since its answer arrived."""
+        if self.pending_step is None:
+            return
+        (event, before), self.pending_step = self.pending_step, None
+        for name in STEP_OUTCOMES:
+            event[name] = self.stats[name] - before[name]
+        self.telemetry.record(event)
+
+    def lookup(self, request):
+        """Return (cache key, cached response or None) for a request; (None, None) without an llm_cache."""
+        if self.llm_cache is None:
+            return None, None
+        base = request_key(self.backend.model_id, PROMPT_VERSION, request)
+        repeat = self.asked.get(base, 0)
+        self.asked[base] = repeat + 1
+        key = request_key(self.backend.model_id, PROMPT_VERSION, request, repeat)
+        return key, self.llm_cache.get(key)
+
+    def remember(self, key, response):
+        """Store a backend response under the key from lookup()."""
+        if key is not None:
+            self.llm_cache.put(key, response)
+
+    def move_request(self, board, moves=None, count=1):
+        """The backend.chat() keyword arguments of the prompt_llm() request."""
+        if moves is None:
+            moves = self.legal_moves(board)
+        # Static rules first, so the backend can reuse their evaluated prefix; only the board part changes
+        prompt = f"{PROMPT_PREFIX}Board:\n{encode_board(board)}\nLegal numbers (row,col:numbers):\n{encode_moves(moves)}\n"
+        prompt += "Move:" if count == 1 else f"Your {count} best moves, best first, one per line:"
+        return {
+            "messages": [
                 {"role": "system", "content": "You are a Sudoku-solving assistant."},
                 {"role": "user", "content": prompt}
             ],
-            temperature=0.5  # Lower randomness for more structured output
-        )
+            "temperature": 0.5,  # Lower randomness for more structured output
+            "grammar": move_grammar(moves, count) if self.constrained else None,
+            # Room for every requested move (a free-form answer is not capped, as before)
+            "max_tokens": MOVE_TOKENS * count if self.constrained else None,
+            "prefix": PROMPT_PREFIX  # Same static start for every step and puzzle
+        }
+
+    def parse_proposals(self, text, moves, count):
+        """The legal moves in an LLM answer asking for up to 'count' ranked moves, best first, without repeats."""
+        proposals = []
+        matches = re.findall(r"\((\d+),\s*(\d+),\s*(\d+)\)", text)
+        if not matches:
+            self.stats["parse_failures"] += 1
+        for match in matches:
+            row, col, num = map(int, match)
+            if num not in moves.get((row, col), ()):
+                self.stats["rule_violations"] += 1
+            elif (row, col, num) not in proposals:
+                proposals.append((row, col, num))
+        return proposals[:count]
+
+    def open_moves(self, node, board):
+        """legal_moves() for the node's board, minus the moves that lead to a board visited before."""
+        keys, size = zobrist(node.size), node.size
+        moves = {}
+        for (row, col), nums in self.legal_moves(board).items():
+            cell_keys = keys[row * size + col]
+            moves[row, col] = [num for num in nums if node.key ^ cell_keys[num] not in self.visited]
+        return moves
+
+    def visit(self, node, board, move):
+        """
+        Add the child of 'node' for an LLM 'move' already placed on 'board' (the
+        forced cells are filled in here) and record it in the transposition table.
+        Returns the child, or None if it is a dead end or its board was reached before;
+        either way it stays in node.children as an attempt.
+        """
+        row, col, num = move
+        forced = self.fill_forced(board)
+        child = node.add_child([move] + (forced or []))
+        known = child.key in self.visited
+        self.visited.add(child.key)
+        self.visited.add(node.key ^ zobrist(node.size)[row * node.size + col][num])  # Before filling, see open_moves()
+        if forced is None:
+            self.log(f"🚫 {move} leads to a dead end.")
+            self.stats["dead_ends"] += 1
+            self.dead.add(child.key)
+            return None
+        if child.key in self.dead:
+            self.log(f"♻️ {move} leads to a board already known to fail, skipped.")
+            return None
+        if known:
+            self.log(f"♻️ {move} leads to a board already reached by other moves, skipped.")
+            return None
+        if forced:
+            self.log(f"🧮 Filled {len(forced)} forced cells without the LLM.")
+        return child
 
-        return response["choices"][0]["message"]["content"].strip()
+    def expand(self, node, count, board=None):
+        """
+        Ask for 'count' moves at 'node' and return the new children that are not dead ends
+        (an empty list if the answer gave none), or None without asking if every legal
+        move of the node was tried already. A generator like tot_steps(): use it with 'yield from'.
+        """
+        if board is None:
+            board = node.board
+        moves = self.open_moves(node, board)
+        if not any(moves.values()):
+            return None
+        response = yield self.move_request(board, moves, count)
+        proposals = self.parse_proposals(response_text(response), moves, count)
+        self.log(f"🔍 LLM proposals: {proposals}")
+        children = []
+        for row, col, num in proposals:
+            child_board = board.copy()
+            child_board[row, col] = num
+            child = self.visit(node, child_board, (row, col, num))
+            if child is None:
+                continue
+            child.value = board_value(child_board)
+            if child.value == -math.inf:
+                self.log(f"🚫 ({row}, {col}, {num}) leads to a dead end, pruned.")
+                self.stats["dead_ends"] += 1
+                self.dead.add(child.key)
+                continue
+            children.append(child)
+        return children
+
+    def solve_with_tot(self, max_steps=100, search="chain", width=3, proposals=3):
+        """
+        Main ToT-based solving loop with backtracking and LLM prompting.
+        search="chain" follows one move per step and backtracks one parent at a time.
+        search="beam" and search="best" run a real tree search where every LLM call
+        proposes up to 'proposals' ranked moves: "beam" expands the 'width' best
+        nodes of each layer, "best" always expands the best node found so far.
+        Nodes are ranked by board_value(). max_steps bounds the number of LLM calls.
+        With 'presolve', the cells forced by singles are filled in after every move,
+        so LLM calls are only spent on cells that have a real choice.
+        Moves that lead back to a board visited before (in any order) are left out of
+        the prompt, and boards known to fail are never expanded again.
+        """
+        steps = self.tot_steps(max_steps, search, width, proposals)
+        try:
+            request = next(steps)
+            while True:
+                request = steps.send(self.ask(request))
+        except StopIteration as done:
+            return done.value
 
+    def tot_steps(self, max_steps=100, search="chain", width=3, proposals=3):
+        """
+        The search of solve_with_tot() as a generator that does no LLM calls itself:
+        it yields the backend.chat() keyword arguments of every request, expects the
+        response to be sent back, and returns the result. This lets a scheduler
+        (see llm_scheduler.py) interleave the searches of many puzzles on one backend.
+        The driver reports each answer with record_step(); at the end, the last step
+        event and a 'solve' event with the counters in 'stats' and the wall time go to the telemetry sink.
+        """
+        start = time.perf_counter()
+        result = yield from self._tot_steps(max_steps, search, width, proposals)
+        self.flush_step()  # The last answer has been used too
+        if self.telemetry is not None:
+            self.telemetry.record(dict(
+                self.stats, event="solve", puzzle=self.puzzle.to_line(), model=self.backend.model_id,
+                search=search, solved=not isinstance(result, str),
+                outcome=result if isinstance(result, str) else "solved", wall_ms=(time.perf_counter() - start) * 1000))
+        return result
+
+    def _tot_steps(self, max_steps, search, width, proposals):
+        if self.cache is not None:
+            solution = self.cache.get(self.puzzle)
+            if solution is not None:
+                self.log("💾 Puzzle found in the solution cache, no LLM calls needed.")
+                return solution
+
+        board = self.root.board
+        forced = self.fill_forced(board)
+        if forced is None:
+            self.log("🚨 The puzzle has no solution.")
+            return "Failed to solve"
+        if forced:
+            self.log(f"🧮 Filled {len(forced)} forced cells without the LLM.")
+            self.root = self.current_node = TreeNode(board)
+        self.visited.add(self.root.key)
+
+        if search != "chain":
+            solution = yield from self._search_tree(max_steps, search, width, proposals)
+            if self.cache is not None and not isinstance(solution, str):
+                self.cache.put(self.puzzle, solution)
+            return solution
 
-    def solve_with_tot(self, max_steps=100):
-        """Main ToT-based solving loop with backtracking and LLM prompting."""
         for step in range(max_steps):
-            print(f"\n🔹 Step {step+1} - Current Board State:")
-            self.print_board(self.current_node.board)
-
-            if is_valid_sudoku(self.current_node.board):
-                print("✅ Board is valid. Checking for completion...")
-                if not self.find_empty_location(self.current_node.board):
-                    print("🎉 Sudoku solved!")
-                    return self.current_node.board
+            node = self.current_node
+            board = node.board  # Rebuilt from the moves on the path
+            self.log(f"\n🔹 Step {step+1} - Current Board State:")
+            if self.verbose:
+                self.print_board(board)
+
+            if is_valid_sudoku(board):
+                self.log("✅ Board is valid. Checking for completion...")
+                if not self.find_empty_location(board):
+                    self.log("🎉 Sudoku solved!")
+                    if self.cache is not None:
+                        self.cache.put(self.puzzle, board)
+                    return board
             
+            # An empty cell with no number left to try can never be filled: no need to ask the LLM
+            moves = self.open_moves(node, board)
+            if not all(moves.values()):
+                self.log("🚫 Dead end: an empty cell has no legal number left to try, backtracking...")
+                self.stats["dead_ends"] += 1
+                self.dead.add(node.key)
+                if node.parent:
+                    self.current_node = node.parent
+                    continue
+                self.log("🚨 No more parent nodes, stopping...")
+                return "Failed to solve"
+
             # Ask LLM for the best move
-            move = self.prompt_llm(self.current_node.board)
-            print(f"🔍 LLM Suggested Move: {move}")
+            move = response_text((yield self.move_request(board, moves)))
+            self.log(f"🔍 LLM Suggested Move: {move}")
             
             # Process LLM move
-            new_board = self.apply_move(self.current_node.board, move)
-            if new_board:
-                new_node = self.current_node.add_child(new_board)
-                self.current_node = new_node  # Move to the new state
+            placed = self.apply_move(board, move)
+            if placed:
+                child = self.visit(node, board, placed)
+                if child:
+                    self.current_node = child  # Move to the new state
             else:
-                print("❌ LLM provided an invalid move, backtracking...")
+                self.log("❌ LLM provided an invalid move, backtracking...")
 
             # Check if backtracking is needed
             if self.controller.should_backtrack(self.current_node):
-                print("↩️ Backtracking triggered...")
+                self.log("↩️ Backtracking triggered...")
+                self.stats["backtracks"] += 1
+                self.dead.add(self.current_node.key)
                 if self.current_node.parent:
                     self.current_node = self.current_node.parent  # Move back
                 else:
-                    print("🚨 No more parent nodes, stopping...")
+                    self.log("🚨 No more parent nodes, stopping...")
                     return "Failed to solve"
 
         return "Failed to solve within step limit"
 
+    def _search_tree(self, max_steps, search, width, proposals):
+        """Beam ("beam") or best-first ("best") search over TreeNodes; one LLM call per expansion."""
+        if search not in ("beam", "best"):
+            raise ValueError(f"Unknown search '{search}', choose from: chain, beam, best")
+        self.root.value = board_value(self.root.board)
+        if self.root.value == -math.inf:
+            return "Failed to solve"
+        order = counter()  # Last tie-breaker: earlier (better ranked) proposals first
+        # Equal values go to the board with fewer empty cells, so ties deepen instead of widening
+        frontier = [(-self.root.value, self.root.empty, next(order), self.root)]
+        failures = {}  # Expansions that gave no usable child (bad answer, repeated boards), by node key
+        gave_up = False
+        steps = 0
+        while frontier:
+            if search == "beam":
+                layer = [entry[-1] for entry in sorted(frontier)[:width]]
+                frontier = []
+            else:
+                layer = [heapq.heappop(frontier)[-1]]
+            for node in layer:
+                board = node.board
+                if node.empty == 0:
+                    self.log("🎉 Sudoku solved!")
+                    return board
+                if steps == max_steps:
+                    return "Failed to solve within step limit"
+                steps += 1
+                self.log(f"\n🌳 Step {steps} - expanding a node with value {node.value:.2f}:")
+                if self.verbose:
+                    self.print_board(board)
+                children = yield from self.expand(node, proposals, board)
+                if children is None:
+                    self.log("🚫 Every legal move of this node was tried, dropping it.")
+                    continue
+                for child in children:
+                    heapq.heappush(frontier, (-child.value, child.empty, next(order), child))
+                if children:
+                    continue
+                # One unusable answer says nothing about the node itself: ask again, up to a limit
+                failures[node.key] = failures.get(node.key, 0) + 1
+                if self.controller.should_retry(failures[node.key]):
+                    self.log("❌ No usable move in the answer, the node goes back on the frontier.")
+                    heapq.heappush(frontier, (-node.value, node.empty, next(order), node))
+                else:
+                    self.log("🚨 Too many unusable answers for this node, dropping it.")
+                    gave_up = True
+        if gave_up:  # Some nodes were dropped without their moves being ruled out
+            return "Failed to solve after too many unusable LLM answers"
+        return "Failed to solve"
 
     def is_valid_move(self, board, row, col, num):
         """Check if placing 'num' at (row, col) is valid under Sudoku rules."""
@@ -150,50 +564,60 @@ class LlmSudokuSolver:
             return False
 
         # Check column
-        if num in [board[r][col] for r in range(9)]:
+        if num in [board[r][col] for r in range(len(board))]:
             return False
 
-        # Check 3×3 box
-        start_row, start_col = (row // 3) * 3, (col // 3) * 3
-        for r in range(3):
-            for c in range(3):
+        # Check box
+        box = math.isqrt(len(board))
+        start_row, start_col = (row // box) * box, (col // box) * box
+        for r in range(box):
+            for c in range(box):
                 if board[start_row + r][start_col + c] == num:
                     return False
 
         return True
 
     def apply_move(self, board, move):
-        """Apply a move to the Sudoku board if it's valid."""
+        """Apply a move to the Sudoku board in place if it's valid; returns (row, col, num) or None."""
         try:
             match = re.search(r"\((\d+),\s*(\d+),\s*(\d+)\)", move)
             if not match:
-                print(f"⚠️ Unable to parse move: {move}")
+                self.log(f"⚠️ Unable to parse move: {move}")
+                self.stats["parse_failures"] += 1
                 return None
             
             row, col, num = map(int, match.groups())
 
             if board[row][col] != 0:
-                print(f"❌ Invalid move: Cell ({row}, {col}) is already filled.")
+                self.log(f"❌ Invalid move: Cell ({row}, {col}) is already filled.")
+                self.stats["rule_violations"] += 1
                 return None
 
-            if not (1 <= num <= 9):
-                print(f"❌ Invalid move: Number {num} is out of range.")
+            if not (1 <= num <= len(board)):
+                self.log(f"❌ Invalid move: Number {num} is out of range.")
+                self.stats["rule_violations"] += 1
                 return None
 
             if not self.is_valid_move(board, row, col, num):
-                print(f"❌ Invalid move: {num} at ({row}, {col}) violates Sudoku rules.")
+                self.log(f"❌ Invalid move: {num} at ({row}, {col}) violates Sudoku rules.")
+                self.stats["rule_violations"] += 1
                 return None
 
-            new_board = copy.deepcopy(board)
-            new_board[row][col] = num
-            return new_board
+            board[row, col] = num
+            return row, col, num
 
         except Exception as e:
-            print(f"⚠️ Error applying move: {e}")
+            self.log(f"⚠️ Error applying move: {e}")
+            self.stats["parse_failures"] += 1  # E.g. a row or column outside the board
 
         return None
 
 
+    def log(self, *args):
+        """Print a progress line, unless the solver is quiet."""
+        if self.verbose:
+            print(*args)
+
     def print_board(self, board):
         """Display the Sudoku board."""
         for row in board:
@@ -204,12 +628,13 @@ class LlmSudokuSolver:
 if __name__ == "__main__":
     import os
     import platform
+    import sys
 
     if platform.system() == "Windows":
         os.environ["ANSI_COLORS_DISABLED"] = "1"
     
     
-    # Example usage
+    # Example usage: `python -m sudoku.llm_solver` from the repository root
     board = [
         [5, 3, 0, 0, 7, 0, 0, 0, 0],
         [6, 0, 0, 1, 9, 5, 0, 0, 0],
@@ -222,7 +647,8 @@ if __name__ == "__main__":
         [0, 0, 0, 0, 8, 0, 0, 7, 9]
     ]
 
-    solver = LlmSudokuSolver(board)
+    # Backend name from the command line, e.g. `python -m sudoku.llm_solver fake` (default: LLM_BACKEND)
+    solver = LlmSudokuSolver(board, backend=sys.argv[1] if len(sys.argv) > 1 else None)
     solution = solver.solve_with_tot()
     print("\nFinal Solution:")
     solver.print_board(solution)
\ No newline at end of file
@@ -0,0 +1,20 @@
+import multiprocessing
+import os
+
+
+def run_jobs(function, jobs, workers=None, chunksize=1, ordered=True):
+    """
+    Map a picklable 'function' over 'jobs' across a process pool, as a generator of
+    results. workers=1 runs in this process without a pool (workers=None uses every
+    CPU); with ordered=False results come back in completion order.
+    """
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        yield from map(function, jobs)
+        return
+
+    with multiprocessing.Pool(workers) as pool:
+        if ordered:
+            yield from pool.imap(function, jobs, chunksize)
+        else:
+            yield from pool.imap_unordered(function, jobs, chunksize)
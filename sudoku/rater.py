@@ -0,0 +1,227 @@
+from itertools import combinations
+
+from sudoku.board import as_board
+from sudoku.candidates import digits_of, layout
+
+# Human solving techniques from easiest to hardest; a puzzle's score is the
+# 1-based position of the hardest one it needed ("guess" means none was enough)
+TECHNIQUES = [
+    "hidden single",
+    "naked single",
+    "locked candidates",
+    "naked pair",
+    "hidden pair",
+    "naked triple",
+    "hidden triple",
+    "x-wing",
+    "swordfish",
+    "guess",
+]
+
+# Highest score that still falls in each difficulty band, matching SudokuGenerator's level names
+BANDS = [
+    ("very easy", 1),  # Hidden singles only
+    ("easy", 2),       # Naked singles
+    ("medium", 3),     # Locked candidates
+    ("hard", 7),       # Naked/hidden pairs and triples
+    ("expert", len(TECHNIQUES)),  # Fish, or no technique on the ladder is enough
+]
+
+_INTERSECTIONS = {}
+
+
+def _intersections(size):
+    """(overlap, rest of box, rest of line) for every box and row/column that cross."""
+    if size not in _INTERSECTIONS:
+        units = layout(size).unit_cells
+        boxes, lines = units[2 * size:], units[:2 * size]
+        triples = []
+        for box in boxes:
+            for line in lines:
+                overlap = set(box) & set(line)
+                if overlap:
+                    triples.append((sorted(overlap), sorted(set(box) - overlap), sorted(set(line) - overlap)))
+        _INTERSECTIONS[size] = triples
+    return _INTERSECTIONS[size]
+
+
+class _Ladder:
+    """Candidate masks for one puzzle plus the techniques of the ladder, each of
+    which applies every instance it finds and reports whether anything changed."""
+    def __init__(self, board):
+        self.layout = layout(len(board))
+        self.size = self.layout.size
+        self.cells = list(board.cells)
+        self.cand = [0] * len(self.cells)  # Candidate mask of every empty cell, 0 once filled
+        self.empty = 0
+        peers, all_digits = self.layout.peers, self.layout.all_digits
+        for index, num in enumerate(self.cells):
+            if num == 0:
+                self.empty += 1
+                used = 0
+                for peer in peers[index]:
+                    used |= 1 << self.cells[peer]
+                self.cand[index] = all_digits & ~used
+        self.steps = [self.hidden_single, self.naked_single, self.locked_candidates,
+                      lambda: self.naked_subset(2), lambda: self.hidden_subset(2),
+                      lambda: self.naked_subset(3), lambda: self.hidden_subset(3),
+                      lambda: self.fish(2), lambda: self.fish(3)]
+
+    def place(self, index, num):
+        cand = self.cand
+        self.cells[index] = num
+        cand[index] = 0
+        self.empty -= 1
+        keep = ~(1 << num)
+        for peer in self.layout.peers[index]:
+            cand[peer] &= keep
+
+    def eliminate(self, cells, mask):
+        """Remove 'mask' from the candidates of 'cells'; True if any were there."""
+        cand, changed = self.cand, False
+        for index in cells:
+            if cand[index] & mask:
+                cand[index] &= ~mask
+                changed = True
+        return changed
+
+    def hidden_single(self):
+        cand, progress = self.cand, False
+        for unit in self.layout.unit_cells:
+            once = twice = 0
+            for index in unit:
+                mask = cand[index]
+                twice |= once & mask
+                once |= mask
+            for num in digits_of(once & ~twice):
+                bit = 1 << num
+                for index in unit:
+                    if cand[index] & bit:
+                        self.place(index, num)
+                        progress = True
+                        break
+        return progress
+
+    def naked_single(self):
+        cand, cells, progress = self.cand, self.cells, False
+        for index, mask in enumerate(cand):
+            if mask and mask & (mask - 1) == 0:
+                self.place(index, mask.bit_length() - 1)
+                progress = True
+            elif mask == 0 and cells[index] == 0:
+                raise ValueError("Puzzle has no solution")
+        return progress
+
+    def locked_candidates(self):
+        cand, progress = self.cand, False
+        for overlap, box_rest, line_rest in _intersections(self.size):
+            inside = box_mask = line_mask = 0
+            for index in overlap:
+                inside |= cand[index]
+            if not inside:
+                continue
+            for index in box_rest:
+                box_mask |= cand[index]
+            for index in line_rest:
+                line_mask |= cand[index]
+            # Pointing: confined to the overlap within the box, so gone from the rest of the line
+            if self.eliminate(line_rest, inside & ~box_mask):
+                progress = True
+            # Claiming: confined to the overlap within the line, so gone from the rest of the box
+            if self.eliminate(box_rest, inside & ~line_mask):
+                progress = True
+        return progress
+
+    def naked_subset(self, count):
+        """'count' cells of a unit that share exactly 'count' candidates own those digits."""
+        cand, progress = self.cand, False
+        for unit in self.layout.unit_cells:
+            open_cells = [index for index in unit if 2 <= len(digits_of(cand[index])) <= count]
+            for group in combinations(open_cells, count):
+                mask = 0
+                for index in group:
+                    mask |= cand[index]
+                if len(digits_of(mask)) == count:
+                    if self.eliminate([index for index in unit if index not in group], mask):
+                        progress = True
+        return progress
+
+    def hidden_subset(self, count):
+        """'count' digits confined to the same 'count' cells of a unit leave no room for others there."""
+        cand, progress = self.cand, False
+        for unit in self.layout.unit_cells:
+            spots = {}  # digit -> bitmask of unit positions that can hold it
+            for position, index in enumerate(unit):
+                for num in digits_of(cand[index]):
+                    spots[num] = spots.get(num, 0) | 1 << position
+            nums = [num for num in spots if 2 <= len(digits_of(spots[num] << 1)) <= count]
+            for group in combinations(nums, count):
+                where = mask = 0
+                for num in group:
+                    where |= spots[num]
+                    mask |= 1 << num
+                if len(digits_of(where << 1)) == count:
+                    cells = [unit[position - 1] for position in digits_of(where << 1)]
+                    if self.eliminate(cells, ~mask & self.layout.all_digits):
+                        progress = True
+        return progress
+
+    def fish(self, count):
+        """X-wing (2) and swordfish (3): a digit confined to the same 'count' columns in
+        'count' rows is gone from the rest of those columns, and the same with rows/columns swapped."""
+        cand, size, progress = self.cand, self.size, False
+        units = self.layout.unit_cells
+        for base, cover in ((units[:size], units[size:2 * size]), (units[size:2 * size], units[:size])):
+            for num in range(1, size + 1):
+                bit = 1 << num
+                lines = []
+                for line_index, line in enumerate(base):
+                    where = 0
+                    for position, index in enumerate(line):
+                        if cand[index] & bit:
+                            where |= 1 << position
+                    if 2 <= len(digits_of(where << 1)) <= count:
+                        lines.append((line_index, where))
+                for group in combinations(lines, count):
+                    where = 0
+                    for _, line_where in group:
+                        where |= line_where
+                    positions = digits_of(where << 1)
+                    if len(positions) == count:
+                        inside = {line_index for line_index, _ in group}
+                        for position in positions:
+                            others = [index for line_index, index in enumerate(cover[position - 1])
+                                      if line_index not in inside]
+                            if self.eliminate(others, bit):
+                                progress = True
+        return progress
+
+    def run(self):
+        """Apply the easiest technique that makes progress until the puzzle is solved
+        or the ladder runs out. Returns the score of the hardest technique used."""
+        hardest = 0
+        while self.empty:
+            for level, step in enumerate(self.steps, 1):
+                if step():
+                    hardest = max(hardest, level)
+                    break
+            else:
+                return len(TECHNIQUES)  # Stuck: only trial and error is left
+        return hardest
+
+
+def rate(board):
+    """
+    Grade a puzzle by the hardest human technique needed to solve it.
+    Returns (score, technique): score is 1..len(TECHNIQUES), 0 for a full board.
+    """
+    score = _Ladder(as_board(board)).run()
+    return score, TECHNIQUES[score - 1] if score else None
+
+
+def difficulty_of(board):
+    """Map a puzzle's rating onto SudokuGenerator's difficulty names."""
+    score, _ = rate(board)
+    for name, highest in BANDS:
+        if score <= highest:
+            return name
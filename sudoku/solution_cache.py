@@ -0,0 +1,38 @@
+from sudoku.config import CACHE_PATH
+
+_SHARED = {}
+
+
+def make_cache(cache):
+    """
+    Normalize a solver's 'cache' argument: None/False, True (default file), a database
+    path or a SolutionCache. sudoku.canonical (NumPy, SQLite) is only imported once a
+    cache is actually requested, so solving without one needs neither.
+    """
+    if cache is None or cache is False:
+        return None
+    if cache is True:
+        cache = CACHE_PATH
+    if isinstance(cache, str):
+        if cache not in _SHARED:
+            from sudoku.canonical import SolutionCache
+            _SHARED[cache] = SolutionCache(cache)  # One connection per file and process
+        return _SHARED[cache]
+    return cache
+
+
+class CachedSolver:
+    """
+    Solution cache handling shared by the solvers: open_cache() in __init__ (after
+    'board' and 'puzzle' are set) and store_solution() once the board is solved.
+    """
+    def open_cache(self, cache):
+        self.cache = make_cache(cache)  # Solutions keyed by canonical form, off unless requested
+        # A known puzzle, or any symmetric variant of one, starts out solved
+        self.cached = self.cache is not None and self.cache.fill(self.board)
+
+    def store_solution(self):
+        """Add the solved board to the cache, unless it came from there."""
+        if self.cache is not None and not self.cached:
+            self.cache.put(self.puzzle, self.board)
+            self.cached = True
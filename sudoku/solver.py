@@ -1,215 +1,606 @@
-import random
-from collections import defaultdict
+import math
+from collections import deque
+
+from sudoku.board import as_board
+from sudoku.candidates import CandidateGrid, digits_of
+from sudoku.pool import run_jobs
+from sudoku.solution_cache import CachedSolver
+
+
+class SolverTrace:
+    """
+    Opt-in record of solver decisions as compact (op, row, col, num) events.
+
+    Events go into a ring buffer holding the last 'maxlen' of them, or are
+    handed to 'sink' as they happen when one is given. Text is only built
+    when lines() is read, e.g. by print_thoughts().
+    """
+    MESSAGES = {
+        "place": "Placing {num} at ({row}, {col})",
+        "backtrack": "Backtracking at ({row}, {col}), removing {num}",
+        "unwind": "Backtracking deeper: Removed {num} at ({row}, {col})",
+    }
+
+    def __init__(self, maxlen=10000, sink=None):
+        self.events = deque(maxlen=maxlen)
+        self.sink = sink
+
+    def __call__(self, op, row, col, num):
+        """Record one event."""
+        if self.sink is not None:
+            self.sink((op, row, col, num))
+        else:
+            self.events.append((op, row, col, num))
+
+    def lines(self):
+        """Render the buffered events as readable lines, lazily."""
+        for op, row, col, num in self.events:
+            yield self.MESSAGES[op].format(row=row, col=col, num=num)
+
+
+def make_trace(trace):
+    """
+    Build a solver's tracer from its 'trace' argument: None/False turns tracing off,
+    True uses the default ring buffer, an int sets the buffer size, a callable
+    becomes the sink, and a SolverTrace is used as is.
+    """
+    if trace is None or trace is False:
+        return None
+    if trace is True:
+        return SolverTrace()
+    if isinstance(trace, SolverTrace):
+        return trace
+    if isinstance(trace, int):
+        return SolverTrace(maxlen=trace)
+    if callable(trace):
+        return SolverTrace(sink=trace)
+    raise TypeError(f"Unsupported trace option: {trace!r}")
+
+
+def print_trace(trace):
+    """Print a solver's reasoning steps from its tracer."""
+    if trace is None:
+        print("Tracing is off; create the solver with trace=True to record its reasoning.")
+        return
+    for line in trace.lines():
+        print(line)
+
+
+class StackSearch:
+    """
+    Iterative depth-first search over a solver's CandidateGrid using an explicit stack.
+
+    run(max_nodes) expands at most 'max_nodes' search nodes (branching guesses)
+    and returns "solved", "failed" or "paused". A paused search keeps its stack,
+    so calling run() again continues exactly where it stopped.
+    """
+    def __init__(self, solver, propagate=True, mrv=True):
+        self.solver = solver
+        self.propagate = propagate  # Fill forced cells before every branch
+        self.mrv = mrv  # Branch on the most constrained cell instead of the first empty one
+        # Frames: [row, col, candidates, next index, trail mark and history depth before
+        # propagation, trail mark and history depth before each guess, guess pending]
+        self.stack = []
+        self.status = None  # None until started, then "running", "solved" or "failed"
+
+    def _open(self):
+        """Propagate and push a frame for the next branching cell. Returns False on a dead end."""
+        solver = self.solver
+        grid = solver.grid
+        mark, depth = grid.mark(), len(solver.history)
+        if self.propagate:
+            consistent = grid.propagate(solver.history)
+            solver.stats["forced"] += len(solver.history) - depth
+            if not consistent:
+                grid.undo(mark)
+                del solver.history[depth:]
+                return False
+
+        if self.mrv:
+            empty = grid.best_cell()
+        else:
+            empty = solver.find_empty_location()
+        if not empty:
+            self.status = "solved"  # Puzzle solved
+            return True
 
-class TreeSearchSudokuSolver:
-    def __init__(self, board):
-        self.board = board
-        self.memory = []  # Stores past moves
-        self.history = []  # Tracks paths explored
-        self.thoughts = []  # Logs the decision process
+        row, col = empty[0], empty[1]
+        candidates = solver.score_moves(row, col)  # Get ranked move options
+        self.stack.append([row, col, candidates, 0, mark, depth, grid.mark(), len(solver.history), False])
+        return True
+
+    def run(self, max_nodes=None):
+        """Expand up to 'max_nodes' search nodes (no limit if None) and report the status."""
+        solver = self.solver
+        grid, history, trace, stats = solver.grid, solver.history, solver.trace, solver.stats
+        if self.status is None:
+            self.status = "running"
+            if not self._open():
+                self.status = "failed"
+
+        nodes = 0
+        stack = self.stack
+        while self.status == "running":
+            frame = stack[-1]
+            row, col, candidates, index, mark, depth, guess_mark, guess_depth, pending = frame
+
+            if pending:
+                # The last guess in this frame led nowhere: take it back
+                grid.undo(guess_mark)
+                del history[guess_depth:]
+                frame[8] = False
+                stats["backtracks"] += 1
+                if trace:
+                    trace("backtrack", row, col, candidates[index - 1])
+
+            if index == len(candidates):
+                # Every option failed: undo what propagation forced on this path
+                stack.pop()
+                grid.undo(mark)
+                del history[depth:]
+                if not stack:
+                    self.status = "failed"  # No solution found
+                continue
+
+            if max_nodes is not None and nodes >= max_nodes:
+                return "paused"
+
+            num = candidates[index]
+            nodes += 1
+            stats["nodes"] += 1
+            frame[3] = index + 1
+            frame[8] = True
+            grid.assign(row, col, num)
+            history.append((row, col, num))
+            if trace:
+                trace("place", row, col, num)
+            self._open()
+
+        return self.status
+
+    def reset(self):
+        """Abandon the search and restore the board to its starting state."""
+        self.solver.grid.undo(0)
+        del self.solver.history[:]
+        self.stack = []
+        self.status = None
+
+class TreeSearchSudokuSolver(CachedSolver):
+    def __init__(self, board, trace=None, cache=None):
+        self.board = as_board(board)  # Lists of lists are converted; a Board is solved in place
+        self.puzzle = self.board.copy()  # Starting clues
+        self.open_cache(cache)
+        self.grid = CandidateGrid(self.board)  # Row/column/box masks kept in sync with the board
+        self.history = []  # Moves on the current search path
+        self.trace = make_trace(trace)  # Decision log, off unless requested
+        # nodes: branching guesses, backtracks: guesses undone,
+        # forced: cells filled by propagation instead of a search node
+        self.stats = {"nodes": 0, "backtracks": 0, "forced": 0}
+        self.search = StackSearch(self)
 
     def is_valid(self, row, col, num):
         """Check if placing 'num' at 'board[row][col]' follows Sudoku rules."""
-        for x in range(9):
-            if self.board[row][x] == num or self.board[x][col] == num:
-                return False
-        
-        start_row, start_col = 3 * (row // 3), 3 * (col // 3)
-        for i in range(3):
-            for j in range(3):
-                if self.board[i + start_row][j + start_col] == num:
-                    return False
-        return True
+        return self.grid.is_valid(row, col, num)
 
     def find_empty_location(self):
         """Find the first empty cell in the board (0 represents empty)."""
-        for i in range(9):
-            for j in range(9):
-                if self.board[i][j] == 0:
-                    return (i, j)
-        return None
+        index = self.board.cells.find(0)
+        if index < 0:
+            return None
+        return divmod(index, self.board.size)
 
     def score_moves(self, row, col):
         """
-        Rank possible numbers (1-9) for a given cell.
+        Rank possible numbers (1-N) for a given cell.
         Scores are based on how often a number appears in row, column, and grid.
         """
-        frequency = defaultdict(int)
-        for x in range(9):
-            if self.board[row][x] != 0:
-                frequency[self.board[row][x]] += 1
-            if self.board[x][col] != 0:
-                frequency[self.board[x][col]] += 1
-        
-        start_row, start_col = 3 * (row // 3), 3 * (col // 3)
-        for i in range(3):
-            for j in range(3):
-                if self.board[i + start_row][j + start_col] != 0:
-                    frequency[self.board[i + start_row][j + start_col]] += 1
-
-        # Score lower-frequency numbers higher (prefer less common choices)
-        candidates = [(num, frequency[num]) for num in range(1, 10) if self.is_valid(row, col, num)]
-        candidates.sort(key=lambda x: x[1])  # Sort by lowest frequency
-
-        return [num for num, _ in candidates]
+        # A legal number never appears in the cell's row, column or grid, so every
+        # candidate has frequency 0 and the ranking reduces to ascending order.
+        return digits_of(self.grid.candidates(row, col))
 
     def solve(self):
-        """Tree-of-Thought approach: Explore multiple move options with backtracking."""
-        empty = self.find_empty_location()
-        if not empty:
-            return True  # Puzzle solved
-
-        row, col = empty
-        candidates = self.score_moves(row, col)  # Get ranked move options
-
-        for num in candidates:
-            self.board[row][col] = num
-            self.history.append((row, col, num))
-            self.thoughts.append(f"Placing {num} at ({row}, {col})")
-
-            if self.solve():  # Recursive step
-                return True  # Success
-
-            # Backtrack if the path failed
-            self.board[row][col] = 0
-            self.history.pop()
-            self.thoughts.append(f"Backtracking at ({row}, {col}), removing {num}")
-
-        return False  # No solution found in this path
+        """
+        Tree-of-Thought approach: fill every forced cell by propagation, then
+        branch on the cell with the fewest candidates (MRV) with backtracking.
+        """
+        return self.search.run() == "solved"
 
     def print_thoughts(self):
         """Print the reasoning steps taken by the solver."""
-        print("\n".join(self.thoughts))
-
-    def solve_with_tot(self, max_steps=100):
-        """Attempt solving using ToT principles with a step limit."""
-        for _ in range(max_steps):
-            if self.solve():
-                return self.to_string()
-            self.backtrack()  # If stuck, backtrack to explore other options
+        print_trace(self.trace)
+
+    def solve_with_tot(self, max_steps=None):
+        """
+        Attempt solving using ToT principles, expanding at most 'max_steps' search nodes.
+        When the budget runs out the search is paused; calling again resumes it.
+        """
+        status = self.search.run(max_steps)
+        if status == "solved":
+            self.store_solution()
+            return self.to_string()
+        if status == "paused":
+            return "Failed to solve within step limit"
         return "Failed to solve"
 
     def backtrack(self):
-        """Backtrack to the last decision point and try a different path."""
-        if not self.history:
-            return
-        row, col, num = self.history.pop()
-        self.board[row][col] = 0
-        self.thoughts.append(f"Backtracking deeper: Removed {num} at ({row}, {col})")
-        self.backtrack()  # Continue backtracking if needed
+        """Backtrack all the way to the starting board and discard the paused search."""
+        if self.trace:
+            for row, col, num in reversed(self.history):
+                self.trace("unwind", row, col, num)
+        self.search.reset()
 
     def to_string(self):
         """Convert the board to a string for easy visualization."""
         return '\n'.join([' '.join(str(cell) for cell in row) for row in self.board])
 
 
-class BacktrackingSudokuSolver:
-    def __init__(self, board):
-        self.board = board
-        self.memory = []  # Stores past moves
-        self.history = []  # Tracks paths explored
-        self.thoughts = []  # Logs the decision process
+class BacktrackingSudokuSolver(CachedSolver):
+    def __init__(self, board, trace=None, cache=None):
+        self.board = as_board(board)  # Lists of lists are converted; a Board is solved in place
+        self.puzzle = self.board.copy()  # Starting clues
+        self.open_cache(cache)
+        self.grid = CandidateGrid(self.board)  # Row/column/box masks kept in sync with the board
+        self.history = []  # Moves on the current search path
+        self.trace = make_trace(trace)  # Decision log, off unless requested
+        self.stats = {"nodes": 0, "backtracks": 0}
+        self.search = StackSearch(self, propagate=False, mrv=False)
 
     def is_valid(self, row, col, num):
         """Check if placing 'num' at 'board[row][col]' follows Sudoku rules."""
-        for x in range(9):
-            if self.board[row][x] == num or self.board[x][col] == num:
-                return False
-        
-        start_row, start_col = 3 * (row // 3), 3 * (col // 3)
-        for i in range(3):
-            for j in range(3):
-                if self.board[i + start_row][j + start_col] == num:
-                    return False
-        return True
+        return self.grid.is_valid(row, col, num)
 
     def find_empty_location(self):
         """Find the first empty cell in the board (0 represents empty)."""
-        for i in range(9):
-            for j in range(9):
-                if self.board[i][j] == 0:
-                    return (i, j)
-        return None
+        index = self.board.cells.find(0)
+        if index < 0:
+            return None
+        return divmod(index, self.board.size)
 
     def score_moves(self, row, col):
         """
-        Rank possible numbers (1-9) for a given cell.
+        Rank possible numbers (1-N) for a given cell.
         Scores are based on how often a number appears in row, column, and grid.
         """
-        frequency = defaultdict(int)
-        for x in range(9):
-            if self.board[row][x] != 0:
-                frequency[self.board[row][x]] += 1
-            if self.board[x][col] != 0:
-                frequency[self.board[x][col]] += 1
-        
-        start_row, start_col = 3 * (row // 3), 3 * (col // 3)
-        for i in range(3):
-            for j in range(3):
-                if self.board[i + start_row][j + start_col] != 0:
-                    frequency[self.board[i + start_row][j + start_col]] += 1
-
-        # Score lower-frequency numbers higher (prefer less common choices)
-        candidates = [(num, frequency[num]) for num in range(1, 10) if self.is_valid(row, col, num)]
-        candidates.sort(key=lambda x: x[1])  # Sort by lowest frequency
-
-        return [num for num, _ in candidates]
+        # A legal number never appears in the cell's row, column or grid, so every
+        # candidate has frequency 0 and the ranking reduces to ascending order.
+        return digits_of(self.grid.candidates(row, col))
 
     def solve(self):
-        """Tree-of-Thought approach: Explore multiple move options with backtracking."""
-        empty = self.find_empty_location()
-        if not empty:
-            return True  # Puzzle solved
+        """Classic backtracking: fill the first empty cell, trying candidates in order."""
+        return self.search.run() == "solved"
 
-        row, col = empty
-        candidates = self.score_moves(row, col)  # Get ranked move options
+    def print_thoughts(self):
+        """Print the reasoning steps taken by the solver."""
+        print_trace(self.trace)
 
-        for num in candidates:
-            self.board[row][col] = num
-            self.history.append((row, col, num))
-            self.thoughts.append(f"Placing {num} at ({row}, {col})")
+    def solve_with_tot(self, max_steps=None):
+        """
+        Attempt solving using ToT principles, expanding at most 'max_steps' search nodes.
+        When the budget runs out the search is paused; calling again resumes it.
+        """
+        status = self.search.run(max_steps)
+        if status == "solved":
+            self.store_solution()
+            return self.to_string()
+        if status == "paused":
+            return "Failed to solve within step limit"
+        return "Failed to solve"
 
-            if self.solve():  # Recursive step
-                return True  # Success
+    def backtrack(self):
+        """Backtrack all the way to the starting board and discard the paused search."""
+        if self.trace:
+            for row, col, num in reversed(self.history):
+                self.trace("unwind", row, col, num)
+        self.search.reset()
 
-            # Backtrack if the path failed
-            self.board[row][col] = 0
-            self.history.pop()
-            self.thoughts.append(f"Backtracking at ({row}, {col}), removing {num}")
+    def to_string(self):
+        """Convert the board to a string for easy visualization."""
+        return '\n'.join([' '.join(str(cell) for cell in row) for row in self.board])
 
-        return False  # No solution found in this path
+
+class DancingLinksSudokuSolver(CachedSolver):
+    """
+    Exact-cover solver (Knuth's Algorithm X with Dancing Links).
+
+    Each of the N^3 (row, col, num) placements is a row of the cover matrix
+    and covers 4 of its 4*N^2 columns: the cell, and num in the row, column and box
+    (729 rows and 324 columns for a 9x9 board).
+    The links live in flat lists indexed by node id; node 0 is the root header
+    and nodes 1..4*N^2 are the column headers.
+    """
+    def __init__(self, board, trace=None, cache=None):
+        self.board = as_board(board)  # Lists of lists are converted; a Board is solved in place
+        self.puzzle = self.board.copy()  # Starting clues
+        self.open_cache(cache)
+        self.n = self.board.size  # Board size (9, 16, 25...)
+        self.history = []  # Moves on the current search path
+        self.trace = make_trace(trace)  # Decision log, off unless requested
+        self.stats = {"nodes": 0, "backtracks": 0}
+        self.frames = []
+        self._build()
+        self._reset()
+
+    def _build(self):
+        """Build the cover matrix and remove the rows fixed by the given clues."""
+        n = self.n
+        box_size = math.isqrt(n)
+        if box_size * box_size != n:
+            raise ValueError(f"Board size must be a perfect square (4, 9, 16, 25...), got {n}")
+        cells = n * n
+        columns = 4 * cells
+        self.left = list(range(-1, columns))
+        self.right = list(range(1, columns + 2))
+        self.left[0], self.right[columns] = columns, 0
+        self.up = list(range(columns + 1))
+        self.down = list(range(columns + 1))
+        self.column = list(range(columns + 1))
+        self.size = [0] * (columns + 1)
+        self.placement = [None] * (columns + 1)  # (row, col, num) for every non-header node
+        self.first_node = {}  # (row, col, num) -> first node of its matrix row
+
+        for row in range(n):
+            for col in range(n):
+                box = box_size * (row // box_size) + col // box_size
+                for num in range(1, n + 1):
+                    self._add_row((row, col, num), (
+                        1 + row * n + col,
+                        1 + cells + row * n + num - 1,
+                        1 + 2 * cells + col * n + num - 1,
+                        1 + 3 * cells + box * n + num - 1,
+                    ))
+
+        # Givens are selected up front; a clash between two clues makes the board unsolvable
+        self.consistent = True
+        covered = set()
+        for row in range(n):
+            for col in range(n):
+                num = self.board[row, col]
+                if num == 0:
+                    continue
+                node = self.first_node[(row, col, num)]
+                targets = [self.column[node], self.column[self.right[node]],
+                           self.column[self.right[self.right[node]]], self.column[self.left[node]]]
+                if covered.intersection(targets):
+                    self.consistent = False
+                    return
+                covered.update(targets)
+                self._select(node)
+
+    def _add_row(self, placement, targets):
+        """Append one cover-matrix row whose nodes sit in the 'targets' columns."""
+        first = None
+        for col in targets:
+            node = len(self.column)
+            self.column.append(col)
+            self.placement.append(placement)
+            # Vertical: insert above the column header (at the bottom of the column)
+            self.up.append(self.up[col])
+            self.down.append(col)
+            self.down[self.up[col]] = node
+            self.up[col] = node
+            self.size[col] += 1
+            # Horizontal: circular list through the row's nodes
+            if first is None:
+                first = node
+                self.left.append(node)
+                self.right.append(node)
+            else:
+                self.left.append(self.left[first])
+                self.right.append(first)
+                self.right[self.left[first]] = node
+                self.left[first] = node
+        self.first_node[placement] = first
+
+    def _cover(self, col):
+        """Unlink a column and every row that intersects it."""
+        left, right, up, down, column, size = self.left, self.right, self.up, self.down, self.column, self.size
+        right[left[col]] = right[col]
+        left[right[col]] = left[col]
+        i = down[col]
+        while i != col:
+            j = right[i]
+            while j != i:
+                down[up[j]] = down[j]
+                up[down[j]] = up[j]
+                size[column[j]] -= 1
+                j = right[j]
+            i = down[i]
+
+    def _uncover(self, col):
+        """Relink a column and its rows, exactly reversing _cover."""
+        left, right, up, down, column, size = self.left, self.right, self.up, self.down, self.column, self.size
+        i = up[col]
+        while i != col:
+            j = left[i]
+            while j != i:
+                size[column[j]] += 1
+                down[up[j]] = j
+                up[down[j]] = j
+                j = left[j]
+            i = up[i]
+        right[left[col]] = col
+        left[right[col]] = col
+
+    def _select(self, node):
+        """Cover every column touched by the row containing 'node'."""
+        self._cover(self.column[node])
+        j = self.right[node]
+        while j != node:
+            self._cover(self.column[j])
+            j = self.right[j]
+
+    def _deselect(self, node):
+        """Undo _select for the row containing 'node'."""
+        j = self.left[node]
+        while j != node:
+            self._uncover(self.column[j])
+            j = self.left[j]
+        self._uncover(self.column[node])
+
+    def _reset(self):
+        """Take back every row selected by the search, restoring the matrix to the clues only."""
+        for _, node in reversed(self.frames):
+            if node != self.column[node]:
+                self._deselect(node)
+        self.frames = []  # [column, selected node (the column header before the first)] per depth
+        self.descend = True  # True: pick a column below the top frame; False: try the top frame's next row
+        self.solutions = 0
+        self.first_solution = None
+        self.out_of_steps = False  # Set when the last search was paused by its node budget
+
+    def _search(self, limit, max_steps):
+        """
+        Algorithm X on the explicit stack 'frames'. Records the first solution found
+        and counts solutions; returns "limit" once 'limit' solutions have been seen,
+        "done" when the search space is exhausted, or "paused" after 'max_steps'
+        search nodes. A paused search keeps its stack and continues on the next call.
+        """
+        right, down, size, column, placement = self.right, self.down, self.size, self.column, self.placement
+        frames, trace, stats = self.frames, self.trace, self.stats
+        nodes = 0
+        while True:
+            if self.descend:
+                self.descend = False
+                if right[0] == 0:
+                    if self.solutions == 0:
+                        self.first_solution = [placement[node] for _, node in frames]
+                    self.solutions += 1
+                    if limit is not None and self.solutions >= limit:
+                        return "limit"
+                    continue
+                # Branch on the column with the fewest remaining rows
+                best, best_size = 0, self.n ** 3 + 1
+                col = right[0]
+                while col != 0:
+                    if size[col] < best_size:
+                        best, best_size = col, size[col]
+                        if best_size <= 1:
+                            break
+                    col = right[col]
+                if best_size > 0:
+                    frames.append([best, best])
+                continue
+
+            if not frames:
+                return "done"
+            frame = frames[-1]
+            col, node = frame
+            following = down[node]  # Still linked in its own column while 'node' is selected
+            if following != col and max_steps is not None and nodes >= max_steps:
+                return "paused"
+            if node != col:  # The row tried last led nowhere (or to a solution already counted)
+                self._deselect(node)
+                stats["backtracks"] += 1
+                if trace:
+                    trace("backtrack", *placement[node])
+            if following == col:
+                frames.pop()
+                continue
+            nodes += 1
+            stats["nodes"] += 1
+            frame[1] = following
+            if trace:
+                trace("place", *placement[following])
+            self._select(following)
+            self.descend = True
+
+    def _run(self, limit, max_steps):
+        """Resume the search paused with the same 'limit', or start a new one; sets 'out_of_steps'."""
+        if not (self.out_of_steps and self.limit == limit):
+            self._reset()
+        self.limit = limit
+        status = self._search(limit, max_steps) if self.consistent else "done"
+        self.out_of_steps = status == "paused"
+
+    def count_solutions(self, limit=None, max_steps=None):
+        """
+        Count the solutions of the board, stopping early once 'limit' is reached or
+        after 'max_steps' search nodes ('out_of_steps' tells which; the count is then
+        partial, and calling again with the same 'limit' continues counting).
+        """
+        self._run(limit, max_steps)
+        return self.solutions
+
+    def solve(self, max_steps=None):
+        """Solve the exact-cover problem and write the first solution into the board."""
+        if not self.count_solutions(limit=1, max_steps=max_steps):
+            return False
+        for row, col, num in self.first_solution:
+            self.board[row, col] = num
+            self.history.append((row, col, num))
+        return True
 
     def print_thoughts(self):
         """Print the reasoning steps taken by the solver."""
-        print("\n".join(self.thoughts))
-
-    def solve_with_tot(self, max_steps=100):
-        """Attempt solving using ToT principles with a step limit."""
-        for _ in range(max_steps):
-            if self.solve():
-                return self.to_string()
-            self.backtrack()  # If stuck, backtrack to explore other options
-        return "Failed to solve"
+        print_trace(self.trace)
 
-    def backtrack(self):
-        """Backtrack to the last decision point and try a different path."""
-        if not self.history:
-            return
-        row, col, num = self.history.pop()
-        self.board[row][col] = 0
-        self.thoughts.append(f"Backtracking deeper: Removed {num} at ({row}, {col})")
-        self.backtrack()  # Continue backtracking if needed
+    def solve_with_tot(self, max_steps=None):
+        """
+        Solve with Dancing Links, placing at most 'max_steps' search nodes.
+        When the budget runs out the search is paused; calling again resumes it.
+        """
+        if self.solve(max_steps):
+            self.store_solution()
+            return self.to_string()
+        if self.out_of_steps:
+            return "Failed to solve within step limit"
+        return "Failed to solve"
 
     def to_string(self):
         """Convert the board to a string for easy visualization."""
         return '\n'.join([' '.join(str(cell) for cell in row) for row in self.board])
 
 
+# Solver backends selectable by name, e.g. from main.py
+SOLVERS = {
+    "tree": TreeSearchSudokuSolver,
+    "backtracking": BacktrackingSudokuSolver,
+    "dlx": DancingLinksSudokuSolver,
+}
+
+
+def get_solver(name):
+    """Return the solver class registered under 'name'."""
+    try:
+        return SOLVERS[name]
+    except KeyError:
+        raise ValueError(f"Unknown solver '{name}', expected one of: {', '.join(SOLVERS)}") from None
+
+
+def _solve_one(job):
+    """Solve a single puzzle for solve_many(); runs inside a worker process."""
+    index, puzzle, solver_name, max_steps, cache = job
+    try:
+        solver = get_solver(solver_name)(as_board(puzzle).copy(), cache=cache)
+        solution = solver.solve_with_tot(max_steps)
+    except Exception as e:
+        return index, "error", str(e)
+    if solution == "Failed to solve within step limit":
+        return index, "budget", None
+    if solution == "Failed to solve":
+        return index, "unsolvable", None
+    return index, "solved", solution
+
+
+def solve_many(puzzles, workers=None, chunksize=16, ordered=True, solver="tree", max_steps=None, cache=None):
+    """
+    Solve many puzzles across a process pool, yielding results as they finish.
+
+    puzzles: iterable of boards or one-line strings ('0' or '.' for empty cells).
+    Yields (index, status, solution) where status is "solved", "unsolvable",
+    "budget" (max_steps ran out) or "error", and solution is the to_string()
+    output, None, or the error message. With ordered=False results come back
+    in completion order. workers=1 solves in this process without a pool.
+    cache: True or a database path to share a SolutionCache between workers.
+    """
+    get_solver(solver)  # Fail fast on an unknown backend name, before any result is asked for
+    jobs = ((index, puzzle, solver, max_steps, cache) for index, puzzle in enumerate(puzzles))
+    return run_jobs(_solve_one, jobs, workers, chunksize, ordered)
 
 
 if __name__ == "__main__":
         
-    # Example Usage
+    # Example Usage: `python -m sudoku.solver` from the repository root
     board = [
         [5, 3, 0, 0, 7, 0, 0, 0, 0],
         [6, 0, 0, 1, 9, 5, 0, 0, 0],
@@ -222,15 +613,23 @@ if __name__ == "__main__":
         [0, 0, 0, 0, 8, 0, 0, 7, 9]
     ]
 
-    solver = TreeSearchSudokuSolver(board)
+    solver = TreeSearchSudokuSolver([row[:] for row in board], trace=True)
     solution = solver.solve_with_tot()
     solver.print_thoughts()  # Print reasoning process
     print("TreeSearch solution:\n", solution)
+    print("TreeSearch stats:", solver.stats)
 
 
     
     
-    solver = BacktrackingSudokuSolver(board)
+    solver = BacktrackingSudokuSolver([row[:] for row in board], trace=True)
     solution = solver.solve_with_tot()
     solver.print_thoughts()  # Print reasoning process
-    print("Backtracking solution:\n", solution)
\ No newline at end of file
+    print("Backtracking solution:\n", solution)
+    print("Backtracking stats:", solver.stats)
+
+
+    solver = DancingLinksSudokuSolver([row[:] for row in board])
+    solution = solver.solve_with_tot()
+    print("Dancing Links solution:\n", solution)
+    print("Dancing Links stats:", solver.stats)
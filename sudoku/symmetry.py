@@ -0,0 +1,85 @@
+import random
+from operator import itemgetter
+
+from sudoku.board import Board, as_board
+from sudoku.candidates import layout
+
+
+class Transform:
+    """
+    One validity-preserving symmetry of an NxN Sudoku: relabel digits, permute
+    rows within bands and columns within stacks, permute bands and stacks, and
+    optionally transpose. Applied to a puzzle and its solution together it gives
+    an equivalent puzzle with the same unique solution and the same difficulty.
+
+    digits[num] is the new label of 'num' (digits[0] == 0 keeps empty cells empty);
+    new row r is old row rows[r] and new column c is old column cols[c].
+    """
+    __slots__ = ("size", "digits", "rows", "cols", "transpose", "_source", "_table")
+
+    def __init__(self, digits, rows, cols, transpose=False):
+        self.size = size = len(rows)
+        self.digits = list(digits)
+        self.rows = list(rows)
+        self.cols = list(cols)
+        self.transpose = transpose
+        # Flat index of the source cell of every target cell, and a bytes.translate table for the digits
+        if transpose:
+            self._source = itemgetter(*[self.cols[c] * size + self.rows[r] for r in range(size) for c in range(size)])
+        else:
+            self._source = itemgetter(*[self.rows[r] * size + self.cols[c] for r in range(size) for c in range(size)])
+        self._table = bytes(self.digits) + bytes(range(len(self.digits), 256))
+
+    @classmethod
+    def random(cls, size=9, rng=random):
+        """Draw a uniformly random transform for an NxN board."""
+        box = layout(size).box
+
+        def shuffled(items):
+            items = list(items)
+            rng.shuffle(items)
+            return items
+
+        digits = [0] + shuffled(range(1, size + 1))
+        rows = [band * box + row for band in shuffled(range(box)) for row in shuffled(range(box))]
+        cols = [stack * box + col for stack in shuffled(range(box)) for col in shuffled(range(box))]
+        return cls(digits, rows, cols, rng.random() < 0.5)
+
+    def inverse(self):
+        """Return the transform that undoes this one."""
+        size = self.size
+        digits, rows, cols = [0] * len(self.digits), [0] * size, [0] * size
+        for num, label in enumerate(self.digits):
+            digits[label] = num
+        for new, old in enumerate(self.rows):
+            rows[old] = new
+        for new, old in enumerate(self.cols):
+            cols[old] = new
+        if self.transpose:
+            return Transform(digits, cols, rows, True)  # Old (a, b) sits at new (rows[b], cols[a])
+        return Transform(digits, rows, cols)
+
+    def apply(self, board):
+        """Return the transformed copy of a board."""
+        board = as_board(board)
+        return Board(self.size, bytes(self._source(board.cells)).translate(self._table))
+
+
+def multiply(puzzle, solution, count, rng=random):
+    """
+    Yield 'count' distinct (puzzle, solution) pairs equivalent to a validated unique
+    puzzle, without generating or checking anything: each is the pair under a random
+    Transform. Repeats (e.g. a transform that happens to be a symmetry of the puzzle) are skipped.
+    """
+    puzzle, solution = as_board(puzzle), as_board(solution)
+    seen = {bytes(puzzle.cells)}
+    attempts = 100 * count  # Only reached by tiny boards with few distinct variants
+    while count > 0 and attempts > 0:
+        attempts -= 1
+        transform = Transform.random(puzzle.size, rng)
+        variant = transform.apply(puzzle)
+        key = bytes(variant.cells)
+        if key not in seen:
+            seen.add(key)
+            count -= 1
+            yield variant, transform.apply(solution)
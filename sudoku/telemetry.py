@@ -0,0 +1,87 @@
+import json
+import sys
+import threading
+
+# Events are flat dicts: {"event": "step", ...} for every LLM request and
+# {"event": "solve", ...} once per puzzle (see LlmSudokuSolver.record_step() and tot_steps()).
+
+
+def make_sink(telemetry):
+    """Normalize a solver's 'telemetry' argument: None, a JSONL file path, a sink, or a list of those."""
+    if telemetry is None or telemetry is False:
+        return None
+    if isinstance(telemetry, str):
+        return JsonlSink(telemetry)
+    if isinstance(telemetry, (list, tuple)):
+        return FanOut([make_sink(sink) for sink in telemetry])
+    return telemetry
+
+
+class JsonlSink:
+    """Append every event to a file as one JSON object per line."""
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()  # The scheduler's solvers may share one sink
+        self._file = open(path, "a", encoding="utf-8")
+
+    def record(self, event):
+        with self._lock:
+            self._file.write(json.dumps(event) + "\n")
+            self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+
+class MemorySink:
+    """Keep events in memory and summarize their numeric fields with percentiles."""
+    def __init__(self):
+        self.events = []
+
+    def record(self, event):
+        self.events.append(event)
+
+    def summary(self):
+        """Return {"<event>.<field>": {"count", "total", "mean", "p50", "p95"}} for every numeric field."""
+        values = {}
+        for event in self.events:
+            for field, value in event.items():
+                if isinstance(value, (int, float)) and not isinstance(value, bool):
+                    values.setdefault(f"{event['event']}.{field}", []).append(value)
+        summary = {}
+        for name, numbers in sorted(values.items()):
+            numbers.sort()
+            summary[name] = {"count": len(numbers), "total": sum(numbers), "mean": sum(numbers) / len(numbers),
+                             "p50": percentile(numbers, 50), "p95": percentile(numbers, 95)}
+        return summary
+
+    def print_summary(self):
+        for name, stats in self.summary().items():
+            print(f"{name:32} n={stats['count']:<6} mean={stats['mean']:<10.2f} "
+                  f"p50={stats['p50']:<10.2f} p95={stats['p95']:.2f}")
+
+
+class FanOut:
+    """Send every event to several sinks."""
+    def __init__(self, sinks):
+        self.sinks = sinks
+
+    def record(self, event):
+        for sink in self.sinks:
+            sink.record(event)
+
+
+def percentile(numbers, q):
+    """Nearest-rank percentile of an already sorted, non-empty list."""
+    rank = max(1, -(-q * len(numbers) // 100))  # ceil(q/100 * n)
+    return numbers[int(rank) - 1]
+
+
+if __name__ == "__main__":
+    # Summarize a JSONL telemetry file, e.g. `python -m sudoku.telemetry telemetry.jsonl`
+    sink = MemorySink()
+    with open(sys.argv[1], encoding="utf-8") as lines:
+        for line in lines:
+            if line.strip():
+                sink.record(json.loads(line))
+    sink.print_summary()
@@ -3,7 +3,7 @@
 
 import tkinter as tk
 from tkinter import messagebox
-from sudoku.generator import SudokuGenerator
+from sudoku.bank import PuzzleBank
 
 class SudokuApp:
     def __init__(self, root):
@@ -11,9 +11,9 @@ class SudokuApp:
         self.root.title("Sudoku Game")
         
         self.difficulty = tk.StringVar(value="medium")
-        self.generator = SudokuGenerator(self.difficulty.get())
-        self.board = self.generator.generate_sudoku()
-        self.solution = self.generator.solution
+        self.bank = PuzzleBank()
+        self.bank.start()  # Keep the bank topped up while the game runs
+        self.board, self.solution = self.bank.draw(self.difficulty.get())
         
         self.cells = []
         self.create_ui()
@@ -50,9 +50,7 @@ class SudokuApp:
         tk.Button(button_frame, text="Reset", command=self.reset_board, width=10, height=2).grid(row=1, column=1, padx=5, pady=5)
     
     def new_game(self):
-        self.generator = SudokuGenerator(self.difficulty.get())
-        self.board = self.generator.generate_sudoku()
-        self.solution = self.generator.solution
+        self.board, self.solution = self.bank.draw(self.difficulty.get())
         self.update_board()
     
     def update_board(self):
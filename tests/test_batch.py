@@ -0,0 +1,55 @@
+from sudoku.batch import _to_board, candidate_tensor, propagate_batch
+from sudoku.board import Board
+from sudoku.candidates import CandidateGrid, layout
+from sudoku.generator import SudokuGenerator
+
+
+def _puzzles():
+    puzzles = []
+    for seed, difficulty in enumerate(["very easy", "easy", "medium", "hard", "expert"] * 4):
+        puzzles.append(SudokuGenerator(difficulty, seed=seed).generate_sudoku().copy())
+    # Propagation alone gets stuck on this one
+    puzzles.append(Board.from_line("8..........36......7..9.2...5...7.......457.....1...3...1....68..85...1..9....4.."))
+    # Contradictions: two 5s in the first row, and a cell with no candidate left
+    puzzles.append(Board.from_line("55" + "." * 79))
+    puzzles.append(Board.from_line("12345678." + "........9" + "." * 63))
+    puzzles.append(Board(9))
+    return puzzles
+
+
+def _clues_clash(board):
+    """True if two clues share a row, column or box (CandidateGrid assumes they don't)."""
+    for unit in layout(board.size).unit_cells:
+        nums = [board.cells[index] for index in unit if board.cells[index]]
+        if len(nums) != len(set(nums)):
+            return True
+    return False
+
+
+def test_propagate_batch_matches_scalar_singles():
+    puzzles = _puzzles()
+    cand = candidate_tensor(puzzles)
+    status = propagate_batch(cand)
+    for index, puzzle in enumerate(puzzles):
+        board = puzzle.copy()
+        consistent = not _clues_clash(board) and CandidateGrid(board).propagate([], pointing=False)
+        if not consistent:
+            assert status[index] == "invalid", puzzle.to_line(".")
+        elif board.cells.count(0) == 0:
+            assert status[index] == "solved", puzzle.to_line(".")
+            assert _to_board(cand[index]) == board
+        else:
+            assert status[index] == "open", puzzle.to_line(".")
+            assert _to_board(cand[index]) == board  # Same cells decided as the scalar fixed point
+
+
+def test_batch_of_one_board_size_16():
+    generator = SudokuGenerator("easy", size=16, seed=1)
+    puzzle = generator.generate_sudoku().copy()
+    cand = candidate_tensor([puzzle])
+    assert cand.shape == (1, 16, 16, 16)
+    status = propagate_batch(cand)
+    board = puzzle.copy()
+    CandidateGrid(board).propagate([], pointing=False)
+    assert status[0] == ("solved" if board.cells.count(0) == 0 else "open")
+    assert _to_board(cand[0]) == board
@@ -0,0 +1,65 @@
+import random
+
+import pytest
+
+from sudoku.board import Board
+from sudoku.canonical import canonicalize
+from sudoku.generator import SudokuGenerator
+from sudoku.symmetry import Transform
+
+
+def _puzzles():
+    """Minimal puzzles plus sparse clue sets of the same solutions (where MAX_STATES truncation can kick in)."""
+    rng = random.Random(7)
+    puzzles = []
+    for seed in range(6):
+        generator = SudokuGenerator(seed=seed)
+        generator.generate_full_board()
+        generator.remove_numbers(minimal=True)
+        puzzles.append(generator.board.copy())
+        for clues in (3, 8, 17):
+            keep = set(rng.sample(range(81), clues))
+            puzzles.append(Board(9, bytes(num if index in keep else 0
+                                          for index, num in enumerate(generator.solution.cells))))
+    return puzzles
+
+
+@pytest.mark.parametrize("puzzle", _puzzles(), ids=lambda board: board.to_line("."))
+def test_canonical_form_is_invariant_under_transforms(puzzle):
+    canonical, transform = canonicalize(puzzle)
+    assert transform.apply(puzzle) == canonical
+    rng = random.Random(puzzle.to_line())
+    for _ in range(4):
+        variant = Transform.random(9, rng).apply(puzzle)
+        assert canonicalize(variant)[0] == canonical
+
+
+def test_inverse_transform_restores_the_board():
+    puzzle = _puzzles()[0]
+    _, transform = canonicalize(puzzle)
+    assert transform.inverse().apply(transform.apply(puzzle)) == puzzle
+
+
+def test_large_boards_are_relabelled_and_transposed():
+    generator = SudokuGenerator(size=16, seed=1)
+    generator.generate_full_board()
+    puzzle = Board(16, bytes(num if index % 3 else 0 for index, num in enumerate(generator.solution.cells)))
+    canonical, transform = canonicalize(puzzle)
+    assert transform.apply(puzzle) == canonical
+    rng = random.Random(1)
+    variant = Transform([0] + rng.sample(range(1, 17), 16), range(16), range(16), True).apply(puzzle)
+    assert canonicalize(variant)[0] == canonical
+
+
+def test_solution_cache_answers_exact_puzzles_and_variants(tmp_path):
+    from sudoku.canonical import SolutionCache
+
+    generator = SudokuGenerator(seed=3)
+    puzzle = generator.generate_sudoku()
+    cache = SolutionCache(str(tmp_path / "solutions.sqlite"))
+    assert cache.get(puzzle) is None
+    cache.put(puzzle, generator.solution)
+    assert cache.get(puzzle) == generator.solution
+    transform = Transform.random(9, random.Random(3))
+    assert cache.get(transform.apply(puzzle)) == transform.apply(generator.solution)
+    assert len(cache) == 2  # The variant is stored for exact lookups from now on